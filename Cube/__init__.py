@@ -1,10 +1,24 @@
 import Cube.color
+import Cube.coordinates
 import Cube.cube
+import Cube.cubie_cube
 import Cube.face
 import Cube.face_id
 import Cube.index_translator
 import Cube.location
 import Cube.move
+import Cube.move_journal
+import Cube.move_table
+import Cube.optimal_solver
 import Cube.orientation
+import Cube.permutation
+import Cube.piece_index
+import Cube.reduction_solver
 import Cube.solver
+import Cube.solver_2x2
 import Cube.solver_3x3
+import Cube.sticker_table
+import Cube.symmetry
+import Cube.table_store
+import Cube.two_phase_solver
+import Cube.validator
@@ -0,0 +1,267 @@
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+from Cube.color import COLOR_CODES
+from Cube.cube import Cube, ORDERED_COLORS
+from Cube.cubie_cube import CORNERS, EDGES, CORNER_LOCATIONS, EDGE_LOCATIONS, CENTER_LOCATIONS, get_center_permutations
+from Cube.face_id import FACE_IDS, FACE_ID_INDEXES
+from Cube.move import BlockMove, Move
+from Cube.move_table import MoveTable
+from Cube.orientation import ORIENTATIONS
+
+FNV_OFFSET_BASIS = np.uint64(0xcbf29ce484222325)
+FNV_PRIME = np.uint64(0x100000001b3)
+
+
+class BatchCube:
+    def __init__(self, size: int, states: np.ndarray):
+        """
+        A batch of `size`x`size` cubes, stored as a 2-D array with a row per cube. Each row is a cube state laid out
+        like `Cube.state`, so moves are applied to all the cubes at once as vectorized gathers.
+        :param size: The size of the cubes.
+        :param states: A `uint8` array with a row (of `6 * size * size` color codes) per cube. Used without copying.
+        """
+        self.size: int = size
+        self.states: np.ndarray = states
+
+        self.all_moves: list[Move] = [Move.from_code(code) for code in range(len(ORIENTATIONS) * size * 2)]
+        self._permutations: Optional[np.ndarray] = None
+
+    @staticmethod
+    def solved(size: int, count: int) -> 'BatchCube':
+        """
+        Returns a batch of `count` solved cubes.
+        """
+        state = np.frombuffer(bytes(Cube(size).state), dtype=np.uint8)
+        return BatchCube(size, np.tile(state, (count, 1)))
+
+    @staticmethod
+    def random(count: int, generator: np.random.Generator = None) -> 'BatchCube':
+        """
+        Samples a batch of `count` uniformly random 3x3 cubes out of all the cubes which can be reached by moves,
+        without applying moves (see: `CubieCube.random`).
+        :param count: The number of cubes.
+        :param generator: The random number generator to use.
+        :return: The batch of random cubes.
+        """
+        if generator is None:
+            generator = np.random.default_rng()
+
+        center_permutations = np.array(get_center_permutations())[generator.integers(24, size=count)]
+        corner_permutations = np.argsort(generator.random((count, len(CORNERS))), axis=1)
+        edge_permutations = np.argsort(generator.random((count, len(EDGES))), axis=1)
+        wrong_parity = (_get_permutations_parities(corner_permutations) ^ _get_permutations_parities(edge_permutations)
+                        != _get_permutations_parities(center_permutations))
+        edge_permutations[wrong_parity, -2:] = edge_permutations[wrong_parity, -1:-3:-1]
+
+        corner_orientations = generator.integers(3, size=(count, len(CORNERS)))
+        corner_orientations[:, -1] = -corner_orientations[:, :-1].sum(axis=1) % 3
+        edge_orientations = generator.integers(2, size=(count, len(EDGES)))
+        edge_orientations[:, -1] = edge_orientations[:, :-1].sum(axis=1) % 2
+
+        face_codes = np.array([COLOR_CODES[ORDERED_COLORS[face_id]] for face_id in FACE_IDS], dtype=np.uint8)
+        states = np.empty((count, len(FACE_IDS) * 9), dtype=np.uint8)
+        states[:, [location.to_index(3) for location in CENTER_LOCATIONS]] = face_codes[center_permutations]
+        for pieces, pieces_locations, permutations, orientations in (
+                (CORNERS, CORNER_LOCATIONS, corner_permutations, corner_orientations),
+                (EDGES, EDGE_LOCATIONS, edge_permutations, edge_orientations)):
+            # the codes of the stickers of each piece, starting at its first sticker
+            piece_codes = face_codes[[[FACE_ID_INDEXES[face_id] for face_id in piece] for piece in pieces]]
+            stickers_number = len(pieces[0])
+            for position, locations in enumerate(pieces_locations):
+                for i, location in enumerate(locations):
+                    sticker = (i - orientations[:, position]) % stickers_number
+                    states[:, location.to_index(3)] = piece_codes[permutations[:, position], sticker]
+
+        return BatchCube(3, states)
+
+    @staticmethod
+    def from_cubes(cubes: list[Cube]) -> 'BatchCube':
+        """
+        Returns a batch containing the states of `cubes` (all of the same size).
+        """
+        size = cubes[0].size
+        if any(cube.size != size for cube in cubes):
+            raise ValueError("All the cubes of a batch must be of the same size.")
+
+        states = np.frombuffer(b"".join(cube.state for cube in cubes), dtype=np.uint8)
+        return BatchCube(size, states.reshape(len(cubes), -1).copy())
+
+    def to_cube(self, i: int) -> Cube:
+        return Cube(self.size, state=bytearray(self.states[i].tobytes()))
+
+    def to_cubes(self) -> list[Cube]:
+        return [self.to_cube(i) for i in range(len(self))]
+
+    def copy(self) -> 'BatchCube':
+        return BatchCube(self.size, self.states.copy())
+
+    def get_permutations(self) -> np.ndarray:
+        """
+        Returns an array with a row per move of `self.all_moves`, which holds the sticker permutation of the move (see:
+        `MoveTable`).
+        """
+        if self._permutations is None:
+            move_table = MoveTable.get(self.size)
+            self._permutations = np.array([move_table.get_permutation(move).indexes for move in self.all_moves],
+                                          dtype=np.intp)
+        return self._permutations
+
+    @staticmethod
+    def get_move_ids(moves: Iterable[Union[Move, BlockMove]]) -> np.ndarray:
+        """
+        Converts moves to their indexes in `self.all_moves` (which are their codes, see: `Move.encode`). Block moves
+        (see: `BlockMove`) are converted to the indexes of their single slice moves.
+        """
+        return np.array([move.code for move in Move.expand_blocks(moves)], dtype=np.intp)
+
+    def move(self, move: Union[Move, BlockMove]) -> None:
+        """
+        Applies `move` to all the cubes of the batch.
+        """
+        if isinstance(move, BlockMove):
+            self.execute_moves([move])
+            return
+        permutation = self.get_permutations()[move.code]
+        self.states = self.states[:, permutation]
+
+    def execute_moves(self, moves: list[Union[Move, BlockMove]]) -> None:
+        """
+        Applies `moves` to all the cubes of the batch.
+        """
+        self.execute_compiled(MoveTable.get(self.size).compile(moves).indexes)
+
+    def execute_compiled(self, permutation: tuple[int, ...]) -> None:
+        self.states = self.states[:, np.asarray(permutation, dtype=np.intp)]
+
+    def move_rows(self, move_ids: np.ndarray) -> None:
+        """
+        Applies a move to each cube of the batch.
+        :param move_ids: The index (in `self.all_moves`) of the move to apply to each cube, or a negative number to
+            leave the cube as is.
+        """
+        move_ids = np.asarray(move_ids, dtype=np.intp)
+        permutations = self.get_permutations()[move_ids]
+        permutations[move_ids < 0] = np.arange(self.states.shape[1])
+        self.states = np.take_along_axis(self.states, permutations, axis=1)
+
+    def execute_rows_moves(self, moves_lists: list[list[Union[Move, BlockMove]]]) -> None:
+        """
+        Applies a different sequence of moves to each cube of the batch.
+        :param moves_lists: The moves to apply to each cube.
+        """
+        moves_lists = [Move.expand_blocks(moves) for moves in moves_lists]
+        steps = max((len(moves) for moves in moves_lists), default=0)
+        move_ids = np.full((len(moves_lists), steps), -1, dtype=np.intp)
+        for i, moves in enumerate(moves_lists):
+            move_ids[i, :len(moves)] = self.get_move_ids(moves)
+
+        for step in range(steps):
+            self.move_rows(move_ids[:, step])
+
+    def shuffle(self, moves_number: int, generator: np.random.Generator = None,
+                avoid_cancellations: bool = False) -> np.ndarray:
+        """
+        Applies a different random sequence of moves to each cube of the batch.
+        :param moves_number: The number of moves to apply to each cube.
+        :param generator: The random number generator to use.
+        :param avoid_cancellations: Whether to never apply a move right after its reverse.
+        :return: The applied move ids (see: `move_rows`), a row per cube.
+        """
+        if generator is None:
+            generator = np.random.default_rng()
+
+        move_ids = generate_shuffle_codes(self.size, (len(self), moves_number), generator, avoid_cancellations)
+        for step in range(moves_number):
+            self.move_rows(move_ids[:, step])
+        return move_ids
+
+    def is_solved(self) -> np.ndarray:
+        """
+        Returns a boolean array which tells for each cube whether each of its faces has a single color.
+        """
+        faces = self.states.reshape(len(self), len(FACE_IDS), self.size * self.size)
+        return np.all(faces == faces[:, :, :1], axis=(1, 2))
+
+    def equals(self, other: 'BatchCube') -> np.ndarray:
+        """
+        Returns a boolean array which tells for each cube whether it equals the cube in the same row of `other`.
+        """
+        return np.all(self.states == other.states, axis=1)
+
+    def hashes(self) -> np.ndarray:
+        """
+        Returns a 64-bit FNV-1a hash of the state of each cube.
+        """
+        hashes = np.full(len(self), FNV_OFFSET_BASIS, dtype=np.uint64)
+        for column in self.states.T:
+            hashes ^= column
+            hashes *= FNV_PRIME
+        return hashes
+
+    def __len__(self):
+        return self.states.shape[0]
+
+
+def _get_permutations_parities(permutations: np.ndarray) -> np.ndarray:
+    """
+    Returns the parity of each row of `permutations` (0 for even and 1 for odd), by counting its inversions.
+    """
+    length = permutations.shape[1]
+    first, second = np.triu_indices(length, 1)
+    return np.sum(permutations[:, first] > permutations[:, second], axis=1) % 2
+
+
+def generate_shuffle_codes(size: int, shape, generator: np.random.Generator,
+                           avoid_cancellations: bool = False) -> np.ndarray:
+    """
+    Generates random move codes (see: `Move.encode`) of a `size`x`size` cube.
+    :param size: The size of the cube.
+    :param shape: The shape of the generated array. The moves of a sequence are along its last axis.
+    :param generator: The random number generator to use.
+    :param avoid_cancellations: Whether to never generate a move right after its reverse in a sequence.
+    :return: An array of move codes.
+    """
+    codes = generator.integers(len(ORIENTATIONS) * size * 2, size=shape)
+    if avoid_cancellations:
+        _redraw_cancellations(codes, len(ORIENTATIONS) * size * 2, generator)
+    return codes
+
+
+def iter_shuffle_code_blocks(size: int, moves_number: int, seed: int = None, block_size: int = 4096,
+                             avoid_cancellations: bool = False) -> Iterator[np.ndarray]:
+    """
+    Generates a reproducible random sequence of move codes (see: `Move.encode`) of a `size`x`size` cube, in blocks
+    which can be passed to `Cube.execute_moves`.
+    :param size: The size of the cube.
+    :param moves_number: The total number of moves to generate.
+    :param seed: A seed which makes the generated moves reproducible.
+    :param block_size: The maximal number of moves in a block.
+    :param avoid_cancellations: Whether to never generate a move right after its reverse (also across blocks).
+    """
+    generator = np.random.default_rng(seed)
+    moves_count = len(ORIENTATIONS) * size * 2
+
+    previous_code = None
+    for block_start in range(0, moves_number, block_size):
+        codes = generator.integers(moves_count, size=min(block_size, moves_number - block_start))
+        if avoid_cancellations:
+            if previous_code is not None:
+                codes = np.concatenate(([previous_code], codes))  # the first code is never redrawn
+            _redraw_cancellations(codes, moves_count, generator)
+            if previous_code is not None:
+                codes = codes[1:]
+            previous_code = codes[-1]
+        yield codes
+
+
+def _redraw_cancellations(codes: np.ndarray, moves_count: int, generator: np.random.Generator) -> None:
+    """
+    Redraws (in place) every code which is the code of the reverse of the code before it (along the last axis).
+    """
+    while True:
+        cancelling = np.nonzero(codes[..., 1:] == (codes[..., :-1] ^ 1))
+        if len(cancelling[-1]) == 0:
+            return
+        codes[cancelling[:-1] + (cancelling[-1] + 1,)] = generator.integers(moves_count, size=len(cancelling[-1]))
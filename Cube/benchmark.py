@@ -0,0 +1,64 @@
+import sys
+import time
+import tracemalloc
+
+from Cube.cube import Cube
+
+
+def measure_size(size: int, moves_number: int = 1000) -> tuple[float, int]:
+    """
+    Measures a `size`x`size` cube.
+    :param size: The size of the cube.
+    :param moves_number: The number of random moves to time.
+    :return: The average latency of a move in seconds, and the peak memory of creating and shuffling the cube in bytes.
+    """
+    tracemalloc.start()
+    cube = Cube(size)
+    cube.execute_moves(cube.iter_shuffle_moves(moves_number))
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    moves = cube.generate_shuffle_moves(moves_number)
+    start = time.perf_counter()
+    cube.execute_moves(moves)
+    move_latency = (time.perf_counter() - start) / moves_number
+    return move_latency, peak_memory
+
+
+def measure_snapshot(size: int, repeats: int = 1000) -> tuple[float, float]:
+    """
+    Measures copying a `size`x`size` cube against taking a snapshot of it and restoring it (see: `Cube.snapshot`).
+    :param size: The size of the cube.
+    :param repeats: The number of times to time each of them.
+    :return: The average latency of a copy, and of a snapshot and a restore, in seconds.
+    """
+    cube = Cube(size)
+    cube.execute_moves(cube.iter_shuffle_moves(100))
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        cube.copy()
+    copy_latency = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        cube.restore(cube.snapshot())
+    snapshot_latency = (time.perf_counter() - start) / repeats
+    return copy_latency, snapshot_latency
+
+
+def main(sizes: list[int]):
+    print(f"{'size':>6} {'move (us)':>10} {'memory (MB)':>12} {'bytes/sticker':>14} {'copy (us)':>10} "
+          f"{'snapshot (us)':>14}")
+    for size in sizes:
+        move_latency, peak_memory = measure_size(size)
+        copy_latency, snapshot_latency = measure_snapshot(size)
+        stickers_number = 6 * size * size
+        print(f"{size:>6} {move_latency * 1e6:>10.1f} {peak_memory / 2 ** 20:>12.2f} "
+              f"{peak_memory / stickers_number:>14.2f} {copy_latency * 1e6:>10.1f} {snapshot_latency * 1e6:>14.1f}")
+        if snapshot_latency >= copy_latency:
+            print(f"Warning: a snapshot and a restore of a {size}x{size} cube are not cheaper than a copy.")
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or [3, 10, 30, 100, 300, 1000])
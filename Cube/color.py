@@ -12,3 +12,7 @@ class Color(Enum):
 
     def __repr__(self):
         return self.name
+
+
+COLORS: tuple[Color, ...] = tuple(Color)  # the i-th color is stored as the sticker code i
+COLOR_CODES: dict[Color, int] = {color: code for code, color in enumerate(COLORS)}
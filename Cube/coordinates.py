@@ -0,0 +1,280 @@
+from array import array
+from functools import lru_cache
+from math import comb, factorial
+
+from Cube.cubie_cube import CubieCube, get_move_cubie_cube
+from Cube.move import Move
+from Cube.orientation import Orientation, ORIENTATIONS
+from Cube.table_store import TableSpec
+
+# The coordinates of a 3x3 cube (see: `CubieCube`) which the table driven solvers search on. Each coordinate is a
+# number in `range(<coordinate>_NUMBER)`, which describes one aspect of the pieces.
+TWISTS_NUMBER = 3 ** 7  # the orientations of the corners (the last one is set by the others)
+FLIPS_NUMBER = 2 ** 11  # the orientations of the edges (the last one is set by the others)
+SLICES_NUMBER = comb(12, 4)  # the positions of the 4 UD-slice edges (FR, FL, BL and BR), regardless of their order
+CORNER_PERMUTATIONS_NUMBER = factorial(8)
+UD_EDGE_PERMUTATIONS_NUMBER = factorial(8)  # the permutation of the U and D edges, while they are in the U and D layers
+SLICE_PERMUTATIONS_NUMBER = factorial(4)  # the permutation of the UD-slice edges, while they are in the UD-slice
+
+SOLVED_SLICE = SLICES_NUMBER - 1  # the UD-slice edges are at the last 4 edge positions
+UNREACHED = 0xff  # the distance of pruning table entries which the goal can not reach (see: `build_pruning_table`)
+
+# The 18 face turns (the outer slices of every orientation, a quarter turn, a half turn or a reversed quarter turn),
+# numbered `(orientation index * 2 + (index == 2)) * 3 + quarter turns - 1`. The U and D faces are the outer slices
+# of the X orientation.
+FACE_TURNS: list[tuple[Orientation, int, int]] = [(orientation, index, quarter_turns) for orientation in ORIENTATIONS
+                                                  for index in (0, 2) for quarter_turns in (1, 2, 3)]
+FACE_TURNS_NUMBER = len(FACE_TURNS)
+# The face turns which keep the corners and the edges oriented and the UD-slice edges in the UD-slice: quarter turns of
+# the U and D faces, and half turns of the other faces.
+PHASE_2_FACE_TURNS: list[int] = [turn for turn, (orientation, _, quarter_turns) in enumerate(FACE_TURNS)
+                                 if orientation is Orientation.X or quarter_turns == 2]
+
+
+def get_face(turn: int) -> int:
+    """
+    Returns the face (0 to 5) of a face turn (see: `FACE_TURNS`). Faces `2 * i` and `2 * i + 1` are opposite.
+    """
+    return turn // 3
+
+
+def get_face_turn_moves(turn: int) -> list[Move]:
+    """
+    Returns the moves of a face turn (see: `FACE_TURNS`), with a half turn as two forward moves (like
+    `Move.simplify`).
+    """
+    orientation, index, quarter_turns = FACE_TURNS[turn]
+    if quarter_turns == 3:
+        return [Move(orientation, index, False)]
+    return [Move(orientation, index, True)] * quarter_turns
+
+
+@lru_cache(maxsize=None)
+def get_face_turn_cubie_cubes() -> list[CubieCube]:
+    """
+    Returns the pieces movement of each face turn (see: `get_move_cubie_cube`).
+    """
+    cubie_cubes = []
+    for orientation, index, quarter_turns in FACE_TURNS:
+        cubie_cube = CubieCube()
+        for _ in range(quarter_turns):
+            cubie_cube = cubie_cube.multiply(get_move_cubie_cube(Move(orientation, index, True)))
+        cubie_cubes.append(cubie_cube)
+    return cubie_cubes
+
+
+def get_twist(corner_orientation: list[int]) -> int:
+    twist = 0
+    for orientation in corner_orientation[:7]:
+        twist = twist * 3 + orientation
+    return twist
+
+
+def set_twist(twist: int) -> list[int]:
+    """
+    Returns the corner orientation of a twist coordinate.
+    """
+    corner_orientation = [0] * 8
+    for i in range(6, -1, -1):
+        twist, corner_orientation[i] = divmod(twist, 3)
+    corner_orientation[7] = -sum(corner_orientation) % 3
+    return corner_orientation
+
+
+def get_flip(edge_orientation: list[int]) -> int:
+    flip = 0
+    for orientation in edge_orientation[:11]:
+        flip = flip * 2 + orientation
+    return flip
+
+
+def set_flip(flip: int) -> list[int]:
+    """
+    Returns the edge orientation of a flip coordinate.
+    """
+    edge_orientation = [0] * 12
+    for i in range(10, -1, -1):
+        flip, edge_orientation[i] = divmod(flip, 2)
+    edge_orientation[11] = sum(edge_orientation) % 2
+    return edge_orientation
+
+
+def get_slice(edge_permutation: list[int]) -> int:
+    """
+    Returns the slice coordinate of an edge permutation: the rank of the positions of the UD-slice edges (8 to 11) in
+    the combinatorial number system.
+    """
+    slice_coordinate = 0
+    slice_edges = 0
+    for position, edge in enumerate(edge_permutation):
+        if edge >= 8:
+            slice_edges += 1
+            slice_coordinate += comb(position, slice_edges)
+    return slice_coordinate
+
+
+def set_slice(slice_coordinate: int) -> list[int]:
+    """
+    Returns an edge permutation with the slice coordinate `slice_coordinate` (see: `get_slice`).
+    """
+    edge_permutation = [-1] * 12
+    position = 11
+    for slice_edges in range(4, 0, -1):
+        while comb(position, slice_edges) > slice_coordinate:
+            position -= 1
+        slice_coordinate -= comb(position, slice_edges)
+        edge_permutation[position] = 7 + slice_edges
+        position -= 1
+
+    other_edges = iter(range(8))
+    return [edge if edge != -1 else next(other_edges) for edge in edge_permutation]
+
+
+def get_permutation_rank(permutation: list[int]) -> int:
+    """
+    Returns the lexicographic rank of a permutation of `0, ..., len(permutation) - 1`.
+    """
+    rank = 0
+    length = len(permutation)
+    for i, item in enumerate(permutation):
+        smaller_after = 0
+        for other in permutation[i + 1:]:
+            if other < item:
+                smaller_after += 1
+        rank = rank * (length - i) + smaller_after
+    return rank
+
+
+def set_permutation_rank(rank: int, length: int) -> list[int]:
+    """
+    Returns the permutation of `0, ..., length - 1` with the lexicographic rank `rank` (see: `get_permutation_rank`).
+    """
+    smaller_after = [0] * length
+    for i in range(length - 1, -1, -1):
+        rank, smaller_after[i] = divmod(rank, length - i)
+    items = list(range(length))
+    return [items.pop(count) for count in smaller_after]
+
+
+def build_twist_move_table() -> array:
+    """
+    Returns the move table of the twist coordinate: the twist after each face turn is at
+    `table[twist * FACE_TURNS_NUMBER + turn]`.
+    """
+    table = array('H')
+    for twist in range(TWISTS_NUMBER):
+        corner_orientation = set_twist(twist)
+        for cubie_cube in get_face_turn_cubie_cubes():
+            table.append(get_twist([(corner_orientation[i] + orientation) % 3 for i, orientation in
+                                    zip(cubie_cube.corner_permutation, cubie_cube.corner_orientation)]))
+    return table
+
+
+def build_flip_move_table() -> array:
+    """
+    Returns the move table of the flip coordinate (see: `build_twist_move_table`).
+    """
+    table = array('H')
+    for flip in range(FLIPS_NUMBER):
+        edge_orientation = set_flip(flip)
+        for cubie_cube in get_face_turn_cubie_cubes():
+            table.append(get_flip([edge_orientation[i] ^ orientation for i, orientation in
+                                   zip(cubie_cube.edge_permutation, cubie_cube.edge_orientation)]))
+    return table
+
+
+def build_slice_move_table() -> array:
+    """
+    Returns the move table of the slice coordinate (see: `build_twist_move_table`).
+    """
+    table = array('H')
+    for slice_coordinate in range(SLICES_NUMBER):
+        edge_permutation = set_slice(slice_coordinate)
+        for cubie_cube in get_face_turn_cubie_cubes():
+            table.append(get_slice([edge_permutation[i] for i in cubie_cube.edge_permutation]))
+    return table
+
+
+def build_corner_permutation_move_table() -> array:
+    """
+    Returns the move table of the rank of the corner permutation (see: `build_twist_move_table`).
+    """
+    table = array('H')
+    for rank in range(CORNER_PERMUTATIONS_NUMBER):
+        corner_permutation = set_permutation_rank(rank, 8)
+        for cubie_cube in get_face_turn_cubie_cubes():
+            table.append(get_permutation_rank([corner_permutation[i] for i in cubie_cube.corner_permutation]))
+    return table
+
+
+def build_ud_edge_permutation_move_table() -> array:
+    """
+    Returns the move table of the rank of the permutation of the U and D edges (see: `build_twist_move_table`). Only
+    the entries of `PHASE_2_FACE_TURNS` are meaningful, since the other turns move U and D edges into the UD-slice.
+    """
+    table = array('H')
+    for rank in range(UD_EDGE_PERMUTATIONS_NUMBER):
+        edge_permutation = set_permutation_rank(rank, 8) + [8, 9, 10, 11]
+        for turn, cubie_cube in enumerate(get_face_turn_cubie_cubes()):
+            if turn in PHASE_2_FACE_TURNS:
+                table.append(get_permutation_rank([edge_permutation[i] for i in cubie_cube.edge_permutation[:8]]))
+            else:
+                table.append(rank)
+    return table
+
+
+def build_slice_permutation_move_table() -> array:
+    """
+    Returns the move table of the rank of the permutation of the UD-slice edges (see: `build_twist_move_table`). Only
+    the entries of `PHASE_2_FACE_TURNS` are meaningful, since the other turns move UD-slice edges out of the UD-slice.
+    """
+    table = array('H')
+    for rank in range(SLICE_PERMUTATIONS_NUMBER):
+        edge_permutation = list(range(8)) + [8 + edge for edge in set_permutation_rank(rank, 4)]
+        for turn, cubie_cube in enumerate(get_face_turn_cubie_cubes()):
+            if turn in PHASE_2_FACE_TURNS:
+                table.append(get_permutation_rank([edge_permutation[i] - 8 for i in cubie_cube.edge_permutation[8:]]))
+            else:
+                table.append(rank)
+    return table
+
+
+def build_pruning_table(first_move_table: array, second_move_table: array, second_number: int, goal: int,
+                        turns: list[int]) -> bytearray:
+    """
+    Finds the distance of every pair of two coordinates from a goal pair by a breadth-first search, so it can bound
+    the number of turns which are left in a search.
+    :param first_move_table: The move table of the first coordinate (see: `build_twist_move_table`).
+    :param second_move_table: The move table of the second coordinate.
+    :param second_number: The number of values of the second coordinate.
+    :param goal: The index of the goal pair.
+    :param turns: The face turns (see: `FACE_TURNS`) which the search may use.
+    :return: The table, which has the distance of the pair `(first, second)` at index `first * second_number + second`.
+        Pairs which can not be reached from the goal by `turns` are marked by `UNREACHED`.
+    """
+    table = bytearray([UNREACHED]) * (len(first_move_table) // FACE_TURNS_NUMBER * second_number)
+    table[goal] = 0
+    frontier = [goal]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for index in frontier:
+            first, second = divmod(index, second_number)
+            first *= FACE_TURNS_NUMBER
+            second *= FACE_TURNS_NUMBER
+            for turn in turns:
+                next_index = first_move_table[first + turn] * second_number + second_move_table[second + turn]
+                if table[next_index] == UNREACHED:
+                    table[next_index] = depth
+                    next_frontier.append(next_index)
+        frontier = next_frontier
+    return table
+
+
+TWIST_MOVE_TABLE = TableSpec("twist_move", 1, build_twist_move_table)
+FLIP_MOVE_TABLE = TableSpec("flip_move", 1, build_flip_move_table)
+SLICE_MOVE_TABLE = TableSpec("slice_move", 1, build_slice_move_table)
+CORNER_PERMUTATION_MOVE_TABLE = TableSpec("corner_permutation_move", 1, build_corner_permutation_move_table)
+UD_EDGE_PERMUTATION_MOVE_TABLE = TableSpec("ud_edge_permutation_move", 1, build_ud_edge_permutation_move_table)
+SLICE_PERMUTATION_MOVE_TABLE = TableSpec("slice_permutation_move", 1, build_slice_permutation_move_table)
@@ -1,76 +1,422 @@
 import random
+from hashlib import blake2b
+from typing import Iterable, Iterator, Optional, Union
 
-from Cube.color import Color
+from Cube.color import Color, COLORS, COLOR_CODES
 from Cube.face import Face
-from Cube.face_id import FaceID, LEFT, UP, RIGHT, DOWN
+from Cube.face_id import FaceID, LEFT, UP, RIGHT, DOWN, FACE_IDS, FACE_ID_INDEXES
 from Cube.location import Location
-from Cube.move import Move
-from Cube.orientation import Orientation
+from Cube.move import Move, BlockMove
+from Cube.move_journal import Checkpoint, MoveJournal, JournalStep
+from Cube.move_table import MoveTable, MOVE_TABLE_MAX_SIZE
+from Cube.orientation import Orientation, ORIENTATIONS
+from Cube.permutation import Permutation
+from Cube.piece_index import PieceIndex
+from Cube.sticker_table import StickerTable
+from Cube.symmetry import Symmetry, SYMMETRIES, ROTATIONS_NUMBER, WHOLE_CUBE_ROTATIONS
 
 ORDERED_COLORS = {FaceID.U: Color.Wh, FaceID.F: Color.Bl, FaceID.R: Color.Or, FaceID.B: Color.Gr,
                   FaceID.L: Color.Re, FaceID.D: Color.Ye}
 
+STICKER_BITS = 3  # the number of bits a sticker takes in `Cube.to_bytes`
+SIZE_BYTES = 2  # the number of bytes which store the size in `Cube.to_bytes`
+_CODES_TO_OCTAL_DIGITS = bytes.maketrans(bytes(range(8)), b"01234567")
+_OCTAL_DIGITS_TO_CODES = bytes.maketrans(b"01234567", bytes(range(8)))
+
 
 class Cube:
-    def __init__(self, size: int, faces: dict[FaceID, Face] = None):
+    def __init__(self, size: int, faces: dict[FaceID, Face] = None, state: bytearray = None):
+        """
+        A `size`x`size` Rubik's Cube. All the stickers of the cube are stored as color codes (see:
+        `Cube.color.COLOR_CODES`) in the single buffer `self.state`: face after face in the order of `FACE_IDS`, and
+        row after row inside each face. The faces in `self.faces` are views of this buffer, so a cube takes a single
+        byte per sticker (`6 * size * size` bytes), and `STICKER_BITS` bits per sticker when serialized.
+        Copies of the cube share its buffer until one of them is changed (see: `copy`).
+        :param size: The number of stickers in a row of a face.
+        :param faces: Initial faces of the cube. The given faces become views of the cube's buffer.
+        :param state: An initial buffer for the cube (which is used without copying). Ignored if `faces` is given.
+        """
         self.size: int = size
+        face_area = size * size
+        rotations = bytearray(len(FACE_IDS))  # the rotations of the faces (see: `Face`)
 
-        if faces is None:
-            faces = dict()
-            for face_id in FaceID:
-                color = ORDERED_COLORS[face_id]
-                stickers = [[color for _ in range(size)] for _ in range(size)]
-                faces[face_id] = Face(size, face_id, stickers)
+        if faces is not None:
+            state = bytearray(len(FACE_IDS) * face_area)
+            for face_id in FACE_IDS:
+                face_index = FACE_ID_INDEXES[face_id]
+                faces[face_id].bind(state, face_index * face_area, rotations, face_index, self)
 
-        self.faces: dict[FaceID, Face] = faces
+        elif state is None:
+            state = bytearray()
+            for face_id in FACE_IDS:
+                state += bytes([COLOR_CODES[ORDERED_COLORS[face_id]]]) * face_area
 
-    def generate_shuffle_moves(self, moves_number: int) -> list[Move]:
-        moves: list[Move] = []
-        for _ in range(moves_number):
-            orientation = random.choice([Orientation.X, Orientation.Y, Orientation.Z])
-            index = random.randint(0, self.size - 1)
-            is_forward = random.choice([True, False])
-            move = Move(orientation, index, is_forward)
+        if faces is None:
+            faces = {face_id: Face(size, face_id, buffer=state, offset=FACE_ID_INDEXES[face_id] * face_area,
+                                   rotations=rotations, rotation_index=FACE_ID_INDEXES[face_id], owner=self)
+                     for face_id in FACE_IDS}
+
+        self._state: bytearray = state
+        self._state_owners: list[int] = [1]  # the number of cubes sharing `self._state`, shared by all of them
+        self._rotations: bytearray = rotations
+        self._reoriented: bool = False  # whether the faces are not at their places in the buffer (see: `reorient`)
+        self.faces: dict[FaceID, Face] = faces
+        self.move_table: MoveTable = MoveTable.get(size) if size <= MOVE_TABLE_MAX_SIZE else None
+        self.piece_index: Optional[PieceIndex] = None
+        self.journal: Optional[MoveJournal] = None
 
-            moves.append(move)
-        return moves
+    @property
+    def state(self) -> bytearray:
+        """
+        The buffer of the cube's stickers (see: `Cube`). The faces which were rotated in O(1) (see: `Face`) and the
+        faces of a reoriented cube (see: `reorient`) are laid out in it first.
+        """
+        if self._reoriented:
+            self._normalize_layout()
+        elif any(self._rotations):
+            for face in self.faces.values():
+                face.materialize()
+        return self._state
+
+    def _normalize_layout(self) -> None:
+        """
+        Lays the faces out in the buffer in the order of `FACE_IDS`, without rotations (see: `reorient`).
+        """
+        codes = b"".join(self.faces[face_id].get_codes() for face_id in FACE_IDS)
+        if self._state_owners[0] > 1:
+            self._state_owners[0] -= 1
+            self._state_owners = [1]
+            self._state = bytearray(codes)
+        else:
+            self._state[:] = codes
+
+        face_area = self.size * self.size
+        for face_id in FACE_IDS:
+            face_index = FACE_ID_INDEXES[face_id]
+            face = self.faces[face_id]
+            face.buffer = self._state
+            face.set_layout(face_index * face_area, face_index)
+        self._rotations[:] = bytes(len(FACE_IDS))
+        self._reoriented = False
+
+    def detach_state(self) -> None:
+        """
+        Makes the cube stop sharing its buffer with its copies (see: `copy`) by copying the buffer, if it is shared.
+        Called before every change to the buffer.
+        """
+        if self._state_owners[0] > 1:
+            self._state_owners[0] -= 1
+            self._state_owners = [1]
+            self._state = bytearray(self._state)
+            for face in self.faces.values():
+                face.buffer = self._state
+
+    def _get_writable_state(self) -> bytearray:
+        state = self.state
+        if self._state_owners[0] > 1:
+            self.detach_state()
+            state = self._state
+        return state
+
+    def generate_shuffle_moves(self, moves_number: int, seed: int = None, avoid_cancellations: bool = False,
+                               max_width: int = 1) -> list[Union[Move, BlockMove]]:
+        return list(self.iter_shuffle_moves(moves_number, seed, avoid_cancellations, max_width))
+
+    def iter_shuffle_moves(self, moves_number: int, seed: int = None, avoid_cancellations: bool = False,
+                           max_width: int = 1) -> Iterator[Union[Move, BlockMove]]:
+        """
+        Generates random moves lazily, so that long shuffles of large cubes do not hold all of their moves. Each move
+        takes a single random draw of its code (see: `Move.encode`).
+        :param moves_number: The number of moves to generate.
+        :param seed: A seed which makes the generated moves reproducible. The global `random` generator is used if not
+            given.
+        :param avoid_cancellations: Whether to never generate a move right after its reverse.
+        :param max_width: The maximal number of slices of a generated move. Moves of more than a single slice are block
+            moves (see: `BlockMove`), and their width takes another random draw.
+        """
+        generator = random.Random(seed) if seed is not None else random
+        moves_count = len(ORIENTATIONS) * self.size * 2
 
-    def move(self, move: Move) -> None:
+        previous_code = None
+        for _ in range(moves_number):
+            if avoid_cancellations and previous_code is not None:
+                code = generator.randrange(moves_count - 1)
+                if code >= previous_code ^ 1:  # skip the code of the reverse of the previous move
+                    code += 1
+            else:
+                code = generator.randrange(moves_count)
+            previous_code = code
+
+            move = Move.from_code(code)
+            if max_width > 1:
+                last_index = min(move.index + generator.randrange(max_width), self.size - 1)
+                if last_index > move.index:
+                    move = BlockMove(move.orientation, move.index, last_index, move.is_forward)
+            yield move
+
+    def move(self, move: Union[Move, BlockMove]) -> None:
+        if isinstance(move, BlockMove):
+            self._move_block(move)
+        else:
+            if self.move_table is None:
+                self.move_strips(move)
+            else:
+                self.move_table.get_permutation(move).apply(self._get_writable_state())
+
+            if self.piece_index is not None:
+                self.piece_index.move_places(*StickerTable.get(self.size).get_place_moves(move))
+
+        if self.journal is not None:
+            self.journal.record(move)
+
+    def _move_block(self, move: BlockMove) -> None:
+        """
+        Applies a block move in a single pass: as a relabeling of the faces for a whole cube rotation (see:
+        `reorient`), as a single compiled permutation, or by cycling all of its strips at once.
+        """
+        if move.last_index >= self.size:
+            raise ValueError(f"The block move {move} exceeds the {self.size} slices of the cube.")
+
+        if move.first_index == 0 and move.last_index == self.size - 1:
+            self._relabel_faces(WHOLE_CUBE_ROTATIONS[move.orientation, move.is_forward])
+        elif self.move_table is None:
+            self.move_strips(move)
+        else:
+            self.move_table.compile([move]).apply(self._get_writable_state())
+
+        if self.piece_index is not None:
+            sticker_table = StickerTable.get(self.size)
+            for single_move in move.get_moves():
+                self.piece_index.move_places(*sticker_table.get_place_moves(single_move))
+
+    def move_strips(self, move: Union[Move, BlockMove]) -> None:
+        """
+        Applies `move` by cycling its strips between the effected faces (and rotating the in-place rotated faces if
+        needed), without using a move table. Takes O(size) per slice, since the in-place rotated faces are rotated in
+        O(1).
+        """
         effected_faces = Orientation.get_orientation_rotation_faces_ids(move.orientation)
+        if isinstance(move, BlockMove):
+            indexes = range(move.first_index, move.last_index + 1)
+            single_moves = [Move(move.orientation, move.first_index, move.is_forward),
+                            Move(move.orientation, move.last_index, move.is_forward)]
+        else:
+            indexes = (move.index,)
+            single_moves = [move]
 
         direction_factor = 1 if move.is_forward else -1
 
-        last_strip = self.faces[effected_faces[0]].get_strip(move.orientation, move.index)
+        if self._state_owners[0] > 1:
+            self.detach_state()
+        state = self._state
+        strip_slices = [[face.get_strip_slice(move.orientation, index) for index in indexes]
+                        for face in (self.faces[face_id] for face_id in effected_faces)]
+        strips = [[state[strip_slice] for strip_slice in face_slices] for face_slices in strip_slices]
 
-        for i in range(len(effected_faces)):
-            new_face_id = effected_faces[((i + 1) * direction_factor) % len(effected_faces)]
-            new_face = self.faces[new_face_id]
+        for i, face_slices in enumerate(strip_slices):
+            # each face gets the strips of its previous face
+            previous_face_strips = strips[(i - direction_factor) % len(strips)]
+            for strip_slice, strip in zip(face_slices, previous_face_strips):
+                state[strip_slice] = strip
 
-            curr_strip = new_face.get_strip(move.orientation, move.index)
-            new_face.set_strip(move.orientation, move.index, last_strip)
-            last_strip = curr_strip
+        for rotated_face_id, clockwise in set(map(self.get_inplace_rotated_face, single_moves)):
+            if rotated_face_id is not None:
+                self.faces[rotated_face_id].rotate_face(clockwise)
 
-        # find inplace-rotated face
+    def get_inplace_rotated_face(self, move: Move) -> tuple[Optional[FaceID], bool]:
+        """
+        Finds the face which is rotated in place by `move`.
+        :param move: The move.
+        :return: The id of the face which is rotated in place by `move` (`None` for an inner slice move), and whether it
+            is rotated clockwise.
+        """
         if move.index == 0:
             if move.orientation is Orientation.X:
-                self.faces[FaceID.U].rotate_face(not move.is_forward)
-            elif move.orientation is Orientation.Y:
-                self.faces[FaceID.L].rotate_face(not move.is_forward)
-            elif move.orientation is Orientation.Z:
-                self.faces[FaceID.B].rotate_face(move.is_forward)
+                return FaceID.U, not move.is_forward
+            if move.orientation is Orientation.Y:
+                return FaceID.L, not move.is_forward
+            if move.orientation is Orientation.Z:
+                return FaceID.B, move.is_forward
         elif move.index == self.size - 1:
             if move.orientation is Orientation.X:
-                self.faces[FaceID.D].rotate_face(move.is_forward)
-            elif move.orientation is Orientation.Y:
-                self.faces[FaceID.R].rotate_face(move.is_forward)
-            elif move.orientation is Orientation.Z:
-                self.faces[FaceID.F].rotate_face(not move.is_forward)
-
-    def execute_moves(self, moves: list[Move]) -> None:
+                return FaceID.D, move.is_forward
+            if move.orientation is Orientation.Y:
+                return FaceID.R, move.is_forward
+            if move.orientation is Orientation.Z:
+                return FaceID.F, not move.is_forward
+        return None, False
+
+    def execute_moves(self, moves: Iterable[Union[Move, BlockMove, int]]) -> None:
+        """
+        Applies moves one after the other.
+        :param moves: Any iterable of moves (including block moves) or of move codes (see: `Move.encode`), such as a
+            generator or an integer array.
+        """
         for move in moves:
+            if not isinstance(move, (Move, BlockMove)):
+                move = Move.from_code(int(move))
             self.move(move)
 
-    def trace_a_moved_sticker(self, original_location: Location, move: Move) -> Location:
+    def reorient(self, symmetry: Symmetry) -> None:
+        """
+        Rotates the whole cube (see: `Symmetry`) in O(1), by relabeling the faces instead of moving stickers: each face
+        becomes a view of the stickers of the face it is rotated from (see: `Symmetry.get_face_relabeling`). The
+        stickers are laid out in their new places only when `self.state` is used.
+        :param symmetry: The rotation of the whole cube.
+        :raise ValueError: If `symmetry` is a mirror.
+        """
+        self._relabel_faces(symmetry)
+
+        if self.piece_index is not None:
+            self._move_piece_index(symmetry.get_permutation(self.size))
+        if self.journal is not None:
+            self.journal.record(symmetry)
+
+    def _relabel_faces(self, symmetry: Symmetry) -> None:
+        layouts = {face_id: (face.offset, face.rotation_index, face.rotation) for face_id, face in self.faces.items()}
+        for face_id, (source_face_id, rotation) in symmetry.get_face_relabeling().items():
+            offset, rotation_index, source_rotation = layouts[source_face_id]
+            self.faces[face_id].set_layout(offset, rotation_index)
+            self._rotations[rotation_index] = (source_rotation + rotation) % 4
+        self._reoriented = True
+
+    def rotate_cube(self, orientation: Orientation, is_forward: bool) -> None:
+        """
+        Rotates the whole cube like moving all the slices of `orientation` in the same direction, in O(1) (see:
+        `reorient`).
+        """
+        self.reorient(WHOLE_CUBE_ROTATIONS[orientation, is_forward])
+
+    def compile_moves(self, moves: list[Move]) -> Permutation:
+        """
+        Compiles a sequence of moves into a single permutation which can be applied with `execute_compiled`. See:
+        `MoveTable.compile`.
+        """
+        return MoveTable.get(self.size).compile(moves)
+
+    def execute_compiled(self, permutation: Permutation) -> None:
+        """
+        Applies a compiled sequence of moves (see: `compile_moves`) in a single pass over the stickers.
+        """
+        permutation.apply(self._get_writable_state())
+
+        if self.piece_index is not None:
+            self._move_piece_index(permutation)
+        if self.journal is not None:
+            self.journal.record(permutation)
+
+    def _move_piece_index(self, permutation: Permutation) -> None:
+        sticker_places = self.piece_index.sticker_places
+        new_places = {sticker_places[index]: sticker_places[i] for i, index in enumerate(permutation.indexes)}
+        moved_places = tuple(place for place, new_place in new_places.items() if place != new_place)
+        self.piece_index.move_places(moved_places, tuple(new_places[place] for place in moved_places))
+
+    def enable_journal(self) -> None:
+        """
+        Starts recording the moves and the compiled sequences applied to the cube (see: `MoveJournal`), so they can be
+        undone and redone. Changes made directly to the state or to the faces are not recorded.
+        """
+        self.journal = MoveJournal()
+
+    def disable_journal(self) -> None:
+        self.journal = None
+
+    def undo(self) -> Optional[JournalStep]:
+        """
+        Undoes the last recorded step by applying its inverse (without copying the state).
+        :return: The undone step, or `None` if there is no step to undo.
+        :raise ValueError: If the journal is not enabled.
+        """
+        journal = self._get_journal()
+        if not journal.done:
+            return None
+        step = journal.done.pop()
+        self._apply_unrecorded(step.reversed() if isinstance(step, (Move, BlockMove)) else step.inverse())
+        journal.undone.append(step)
+        return step
+
+    def redo(self) -> Optional[JournalStep]:
+        """
+        Reapplies the last undone step.
+        :return: The redone step, or `None` if there is no step to redo.
+        :raise ValueError: If the journal is not enabled.
+        """
+        journal = self._get_journal()
+        if not journal.undone:
+            return None
+        step = journal.undone.pop()
+        self._apply_unrecorded(step)
+        journal.done.append(step)
+        return step
+
+    def checkpoint(self) -> Checkpoint:
+        """
+        Marks the current point of the journal, which the cube can be rolled back to with `rollback`.
+        :raise ValueError: If the journal is not enabled.
+        """
+        return self._get_journal().checkpoint()
+
+    def rollback(self, checkpoint: Checkpoint) -> None:
+        """
+        Undoes all the steps recorded after `checkpoint` (see: `checkpoint`). The undone steps can be redone.
+        :raise ValueError: If the journal is not enabled, if `checkpoint` is ahead of the journal, or if the history
+            of `checkpoint` was replaced (by undoing steps before it and then recording other steps).
+        """
+        journal = self._get_journal()
+        if not journal.is_in_history(checkpoint):
+            raise ValueError(f"The history of {checkpoint} was replaced by other steps.")
+        if checkpoint.steps > len(journal):
+            raise ValueError(f"{checkpoint} is ahead of the journal, which has {len(journal)} steps.")
+        while len(journal) > checkpoint.steps:
+            self.undo()
+
+    def _get_journal(self) -> MoveJournal:
+        if self.journal is None:
+            raise ValueError("The journal is not enabled (see: `enable_journal`).")
+        return self.journal
+
+    def _apply_unrecorded(self, step: JournalStep) -> None:
+        journal, self.journal = self.journal, None
+        try:
+            if isinstance(step, (Move, BlockMove)):
+                self.move(step)
+            elif isinstance(step, Symmetry):
+                self.reorient(step)
+            else:
+                self.execute_compiled(step)
+        finally:
+            self.journal = journal
+
+    def enable_piece_index(self) -> None:
+        """
+        Starts maintaining an index of the locations of the pieces (see: `PieceIndex`), which is updated by the moves
+        of the cube. Changes made directly to the state or to the faces are not tracked; call `enable_piece_index` again
+        after them.
+        """
+        self.piece_index = PieceIndex(self.size, self.state)
+
+    def disable_piece_index(self) -> None:
+        self.piece_index = None
+
+    def find_piece_locations(self, colors: list[Color]) -> list[list[Location]]:
+        """
+        Finds the locations of the pieces with the given colors.
+        :param colors: The colors of the piece's stickers.
+        :return: For each piece with these colors, the locations of its stickers. The i-th location is the location of
+            the i-th color in `colors`.
+        """
+        state = self.state
+        piece_index = self.piece_index if self.piece_index is not None else PieceIndex(self.size, state)
+        codes = [COLOR_CODES[color] for color in colors]
+
+        pieces_locations = []
+        for piece in piece_index.find(codes):
+            piece_codes = [state[index] for index in piece]
+            locations = [Location.from_index(piece[piece_codes.index(code)], self.size) for code in codes]
+            pieces_locations.append(locations)
+        return pieces_locations
+
+    def trace_a_moved_sticker(self, original_location: Location, move: Union[Move, BlockMove]) -> Location:
         """
         Returns where `original_location` will be after the move `move` would be applied (Not applies `move` on the
         Cube). `original_location` must be a location that moves to a new face after the move `move` would be applied.
@@ -79,28 +425,22 @@ class Cube:
         :param move: The move to trace the location with.
         :return: The location where `original_location` will be in after the move `move` would be applied.
         """
-        effected_faces = Orientation.get_orientation_rotation_faces_ids(move.orientation)
-        if original_location.face_id not in effected_faces or self.faces[
-            original_location.face_id].find_move_index_from_real_indices(move.orientation,
-                                                                         original_location.row,
-                                                                         original_location.col) != move.index:
+        sticker_table = StickerTable.get(self.size)
+        if isinstance(move, BlockMove):
+            # a sticker which moves to a new face is on a strip of exactly one of the slices
+            for single_move in move.get_moves():
+                new_location = sticker_table.get_trace(single_move).get(original_location)
+                if new_location is not None:
+                    return new_location
             raise ValueError("The given location does not move to another face.")
 
-        direction = 1 if move.is_forward else -1
-        new_face_id = effected_faces[
-            (effected_faces.index(original_location.face_id) + direction) % len(effected_faces)]
-
-        curr_index_translator = self.faces[original_location.face_id].get_strip_index_translator(
-            move.orientation, move.index)
-        new_index_translator = self.faces[new_face_id].get_strip_index_translator(move.orientation, move.index)
-
-        i = curr_index_translator.inverse((original_location.row, original_location.col))
-        new_row, new_col = new_index_translator.translate(i)
-
-        return Location(new_face_id, new_row, new_col)
+        new_location = sticker_table.get_trace(move).get(original_location)
+        if new_location is None:
+            raise ValueError("The given location does not move to another face.")
+        return new_location
 
     def get_location_color(self, location: Location) -> Color:
-        return self.faces[location.face_id][location.row][location.col]
+        return COLORS[self._state[self.faces[location.face_id].get_buffer_index(location.row, location.col)]]
 
     def get_other_sticker_locations(self, sticker_location: Location) -> list[Location]:
         """
@@ -108,8 +448,14 @@ class Cube:
         :param sticker_location: The known sticker location.
         :return: A list contains the other locations of the specified edge.
         """
-        if self.size <= 2:
-            ValueError(f"Cube of size {self.size} does not have edge stickers.")
+        return list(StickerTable.get(self.size).get_other_locations(sticker_location))
+
+    def find_other_sticker_locations(self, sticker_location: Location) -> list[Location]:
+        """
+        Calculates `get_other_sticker_locations` from the geometry of the faces, without using a sticker table.
+        """
+        if self.size < 2:
+            raise ValueError(f"Cube of size {self.size} is a single piece.")
 
         sticker_face, row, col = sticker_location.face_id, sticker_location.row, sticker_location.col
 
@@ -187,14 +533,191 @@ class Cube:
         new_location = self.trace_a_moved_sticker(new_location, move)
         return [move, move], new_location
 
-    def copy(self) -> 'Cube':
-        faces: dict[FaceID: Face] = dict()
+    def copy(self, journal: bool = False) -> 'Cube':
+        """
+        Copies the cube in O(1): the copy shares the buffer and the layouts of the faces of the cube until one of them
+        is changed, and only then the changed cube copies the buffer (see: `detach_state`). The piece index (see:
+        `enable_piece_index`) is copied too, in time linear in the number of pieces.
+        :param journal: Whether to copy the journal (see: `enable_journal`), in time linear in its length. Otherwise the
+            copy has no journal.
+        """
+        cube = Cube.__new__(Cube)
+        cube.size = self.size
+        cube._state = self._state
+        cube._state_owners = self._state_owners
+        cube._state_owners[0] += 1
+        cube._rotations = bytearray(self._rotations)
+        cube._reoriented = self._reoriented
+        cube.faces = {face_id: face.copy_view(cube._rotations, cube) for face_id, face in self.faces.items()}
+        cube.move_table = self.move_table
+        cube.piece_index = self.piece_index.copy() if self.piece_index is not None else None
+        cube.journal = self.journal.copy() if journal and self.journal is not None else None
+        return cube
+
+    def snapshot(self) -> 'CubeSnapshot':
+        """
+        Takes a snapshot of the stickers of the cube in O(1), which the cube can be restored to with `restore`. The
+        snapshot shares the buffer of the cube (see: `copy`), so the cube copies its buffer once it is changed.
+        """
+        return CubeSnapshot(self)
+
+    def restore(self, snapshot: 'CubeSnapshot') -> None:
+        """
+        Restores the stickers of the cube to a snapshot taken with `snapshot`, in O(1) by sharing its buffer. The
+        snapshot can be restored again later. The piece index (see: `enable_piece_index`) is rebuilt, and the journal
+        (see: `enable_journal`) starts over, since its steps do not lead to the restored stickers.
+        :param snapshot: The snapshot to restore.
+        :raise ValueError: If the snapshot is of a cube of another size.
+        """
+        if snapshot.size != self.size:
+            raise ValueError(f"Expected a snapshot of a {self.size}x{self.size} cube, got a "
+                             f"{snapshot.size}x{snapshot.size} one.")
+        is_state_changed = self._state is not snapshot.state
+        if is_state_changed:
+            self._state_owners[0] -= 1
+            self._state = snapshot.state
+            self._state_owners = snapshot.state_owners
+            self._state_owners[0] += 1
+        self._rotations[:] = snapshot.rotations
+
+        if is_state_changed or self._reoriented or snapshot.reoriented:
+            face_area = self.size * self.size
+            for face_id in FACE_IDS:
+                face_index = FACE_ID_INDEXES[face_id]
+                face = self.faces[face_id]
+                face.buffer = self._state
+                offset, rotation_index = (snapshot.layouts[face_index] if snapshot.reoriented else
+                                          (face_index * face_area, face_index))
+                if face.offset != offset or face.rotation_index != rotation_index:
+                    face.set_layout(offset, rotation_index)
+            self._reoriented = snapshot.reoriented
+
+        if self.piece_index is not None:
+            self.enable_piece_index()
+        if self.journal is not None:
+            self.enable_journal()
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes the cube: its size, followed by its stickers (in the order of `self.state`) packed to
+        `STICKER_BITS` bits each.
+        """
+        stickers_number = len(self.state)
+        # each sticker code is a single octal digit, and converting octal digits to an int takes linear time
+        packed = int(bytes(self.state).translate(_CODES_TO_OCTAL_DIGITS) or b"0", 8)
+        return (self.size.to_bytes(SIZE_BYTES, "big") +
+                packed.to_bytes((stickers_number * STICKER_BITS + 7) // 8, "big"))
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'Cube':
+        """
+        Deserializes a cube which was serialized by `to_bytes`.
+        :raise ValueError: If `data` is not a serialized cube.
+        """
+        size = int.from_bytes(data[:SIZE_BYTES], "big")
+        stickers_number = len(FACE_IDS) * size * size
+        if len(data) != SIZE_BYTES + (stickers_number * STICKER_BITS + 7) // 8:
+            raise ValueError(f"Expected {stickers_number} packed stickers of a {size}x{size} cube.")
 
-        for face_id in FaceID:
-            face: Face = self.faces[face_id]
-            faces[face_id] = face.copy()
+        digits = format(int.from_bytes(data[SIZE_BYTES:], "big"), "o").zfill(stickers_number).encode()
+        if len(digits) != stickers_number:
+            raise ValueError("The serialized stickers have extra bits.")
 
-        return Cube(self.size, faces)
+        state = bytearray(digits.translate(_OCTAL_DIGITS_TO_CODES))
+        if state and max(state) >= len(COLORS):
+            raise ValueError("The serialized stickers contain an unknown color.")
+        return Cube(size, state=state)
+
+    def state_hash(self) -> int:
+        """
+        Returns a 64-bit hash of the cube's size and stickers, which is stable between runs (unlike `hash()` of
+        `bytes`).
+        """
+        digest = blake2b(self.size.to_bytes(SIZE_BYTES, "big"), digest_size=8)
+        digest.update(self.state)
+        return int.from_bytes(digest.digest(), "big")
+
+    def get_symmetric(self, symmetry: Symmetry, color_map: dict[Color, Color] = None) -> 'Cube':
+        """
+        Returns the cube which results from applying a symmetry to the whole cube (see: `Symmetry`).
+        :param symmetry: The symmetry to apply.
+        :param color_map: A new color for each color of the cube, to apply after the symmetry.
+        :return: The transformed cube.
+        """
+        state = bytes(symmetry.get_permutation(self.size).permute(self.state))
+        if color_map is not None:
+            translation = bytearray(range(256))
+            for code, color in enumerate(COLORS):
+                translation[code] = COLOR_CODES[color_map.get(color, color)]
+            state = state.translate(translation)
+        return Cube(self.size, state=bytearray(state))
+
+    def canonical_form(self, mirrors: bool = False,
+                       relabel_colors: bool = False) -> tuple['Cube', Symmetry, dict[Color, Color]]:
+        """
+        Finds the representative of the cube out of all the cubes which are the same position up to a rotation of
+        the whole cube (and a mirror, or a relabeling of the colors, if requested): the one with the smallest state.
+        :param mirrors: Whether cubes which are mirrors of each other are the same position.
+        :param relabel_colors: Whether cubes which differ only in the names of their colors are the same position.
+        :return: The representative, and the transform which results in it from the cube (see: `get_symmetric`): the
+            symmetry and the color map.
+        """
+        state = bytes(self.state)
+        best_state, best_symmetry, best_translation = None, None, None
+        for symmetry in SYMMETRIES[:len(SYMMETRIES) if mirrors else ROTATIONS_NUMBER]:
+            symmetric_state = bytes(symmetry.get_permutation(self.size).permute(state))
+            translation = None
+            if relabel_colors:
+                codes = bytes(dict.fromkeys(symmetric_state))  # the colors by the order of their first appearance
+                translation = bytes.maketrans(codes, bytes(range(len(codes))))
+                symmetric_state = symmetric_state.translate(translation)
+            if best_state is None or symmetric_state < best_state:
+                best_state, best_symmetry, best_translation = symmetric_state, symmetry, translation
+
+        color_map = {color: COLORS[best_translation[code]] if best_translation is not None else color
+                     for code, color in enumerate(COLORS)}
+        return Cube(self.size, state=bytearray(best_state)), best_symmetry, color_map
+
+    def canonical_hash(self, mirrors: bool = False, relabel_colors: bool = False) -> int:
+        """
+        Returns a hash which is equal for cubes which are the same position (see: `canonical_form`).
+        """
+        return self.canonical_form(mirrors, relabel_colors)[0].state_hash()
 
     def __eq__(self, cube: 'Cube') -> bool:
-        return self.faces == cube.faces
+        if not isinstance(cube, Cube):
+            return NotImplemented
+        return self.size == cube.size and self.state == cube.state
+
+    def __hash__(self):
+        # cubes are mutable: a cube must not be moved while it is a key of a dict or a member of a set
+        return self.state_hash()
+
+    def __del__(self):
+        owners = getattr(self, "_state_owners", None)
+        if owners is not None:
+            owners[0] -= 1
+
+
+class CubeSnapshot:
+    """
+    The stickers of a cube at the time of `Cube.snapshot`: the buffer of the cube, which the snapshot shares with it
+    (see: `Cube.copy`), and the rotations and the layouts of its faces (see: `Cube.reorient`).
+    """
+    __slots__ = ("size", "state", "state_owners", "rotations", "layouts", "reoriented")
+
+    def __init__(self, cube: Cube):
+        self.size: int = cube.size
+        self.state: bytearray = cube._state
+        self.state_owners: list[int] = cube._state_owners
+        self.state_owners[0] += 1
+        self.rotations: bytes = bytes(cube._rotations)
+        self.reoriented: bool = cube._reoriented
+        # the faces of a cube which is not reoriented are at their places in the buffer (see: `Cube.reorient`)
+        self.layouts: Optional[tuple[tuple[int, int], ...]] = None
+        if self.reoriented:
+            faces = [cube.faces[face_id] for face_id in FACE_IDS]
+            self.layouts = tuple((face.offset, face.rotation_index) for face in faces)
+
+    def __del__(self):
+        self.state_owners[0] -= 1
@@ -0,0 +1,340 @@
+import random
+from functools import lru_cache
+from operator import itemgetter
+from typing import Union
+
+from Cube.color import Color, COLOR_CODES
+from Cube.cube import Cube, ORDERED_COLORS
+from Cube.face_id import FaceID, LEFT, UP, RIGHT, DOWN, FACE_IDS, FACE_ID_INDEXES
+from Cube.location import Location
+from Cube.move import BlockMove, Move
+from Cube.orientation import ORIENTATIONS
+
+# The pieces of a 3x3 cube, each given by the faces of its stickers. A corner's faces are ordered clockwise, starting
+# with its U/D face. A piece's orientation is the index of its first color (U/D color, or F/B color for the FR, FL, BL
+# and BR edges) in the faces of its position.
+CORNERS: list[tuple[FaceID, FaceID, FaceID]] = [
+    (FaceID.U, FaceID.R, FaceID.F), (FaceID.U, FaceID.F, FaceID.L), (FaceID.U, FaceID.L, FaceID.B),
+    (FaceID.U, FaceID.B, FaceID.R), (FaceID.D, FaceID.F, FaceID.R), (FaceID.D, FaceID.L, FaceID.F),
+    (FaceID.D, FaceID.B, FaceID.L), (FaceID.D, FaceID.R, FaceID.B)]
+EDGES: list[tuple[FaceID, FaceID]] = [
+    (FaceID.U, FaceID.R), (FaceID.U, FaceID.F), (FaceID.U, FaceID.L), (FaceID.U, FaceID.B),
+    (FaceID.D, FaceID.R), (FaceID.D, FaceID.F), (FaceID.D, FaceID.L), (FaceID.D, FaceID.B),
+    (FaceID.F, FaceID.R), (FaceID.F, FaceID.L), (FaceID.B, FaceID.L), (FaceID.B, FaceID.R)]
+
+
+def get_piece_locations(face_ids: tuple[FaceID, ...], size: int) -> list[Location]:
+    """
+    Returns the locations of the stickers of the piece which has stickers on all of `face_ids`. Edge pieces of bigger
+    cubes are represented by their middle sticker (for odd sizes) or by the sticker before the middle (for even sizes).
+    :param face_ids: The faces of the piece's stickers.
+    :param size: The size of the cube.
+    :return: The location of the piece's sticker on each of `face_ids`.
+    """
+    locations = []
+    for face_id in face_ids:
+        row = col = (size - 1) // 2
+        for neighbour_face_id in face_ids:
+            if neighbour_face_id is face_id:
+                continue
+            direction = [face_id.get_side_linked_face(d) for d in (LEFT, UP, RIGHT, DOWN)].index(neighbour_face_id)
+            if direction == UP:
+                row = 0
+            elif direction == DOWN:
+                row = size - 1
+            elif direction == LEFT:
+                col = 0
+            else:
+                col = size - 1
+        locations.append(Location(face_id, row, col))
+    return locations
+
+
+CORNER_LOCATIONS: list[list[Location]] = [get_piece_locations(corner, 3) for corner in CORNERS]
+EDGE_LOCATIONS: list[list[Location]] = [get_piece_locations(edge, 3) for edge in EDGES]
+CENTER_LOCATIONS: list[Location] = [Location(face_id, 1, 1) for face_id in FACE_IDS]
+
+_CENTERS_GETTER = itemgetter(*[location.to_index(3) for location in CENTER_LOCATIONS])
+_CORNER_GETTERS = [itemgetter(*[location.to_index(3) for location in locations]) for locations in CORNER_LOCATIONS]
+_EDGE_GETTERS = [itemgetter(*[location.to_index(3) for location in locations]) for locations in EDGE_LOCATIONS]
+
+
+@lru_cache(maxsize=None)
+def _get_pieces_indexes(face_codes: tuple[int, ...]) -> tuple[dict, dict, dict]:
+    """
+    Returns the lookup tables of `CubieCube.from_cube` for the given color code of each face: the face index of each
+    center code, and the index and orientation of the codes of each corner and edge, starting at each of its stickers.
+    """
+    center_indexes = {code: face_index for face_index, code in enumerate(face_codes)}
+
+    corner_indexes = dict()
+    for corner_index, corner in enumerate(CORNERS):
+        codes = [face_codes[FACE_ID_INDEXES[face_id]] for face_id in corner]
+        for orientation in range(3):
+            corner_indexes[tuple(codes[orientation:] + codes[:orientation])] = corner_index, orientation
+
+    edge_indexes = dict()
+    for edge_index, edge in enumerate(EDGES):
+        first_code, second_code = [face_codes[FACE_ID_INDEXES[face_id]] for face_id in edge]
+        edge_indexes[(first_code, second_code)] = edge_index, 0
+        edge_indexes[(second_code, first_code)] = edge_index, 1
+
+    return center_indexes, corner_indexes, edge_indexes
+
+
+class CubieCube:
+    def __init__(self, corner_permutation: list[int] = None, corner_orientation: list[int] = None,
+                 edge_permutation: list[int] = None, edge_orientation: list[int] = None,
+                 center_permutation: list[int] = None):
+        """
+        A 3x3 cube represented by its pieces instead of its stickers. The i-th item of a permutation is the index of the
+        piece (see: `CORNERS`, `EDGES` and `FACE_IDS`) which is placed at the i-th position, and the i-th item of an
+        orientation is the orientation of that piece. Unspecified parts are solved.
+        """
+        self.corner_permutation: list[int] = list(range(8)) if corner_permutation is None else corner_permutation
+        self.corner_orientation: list[int] = [0] * 8 if corner_orientation is None else corner_orientation
+        self.edge_permutation: list[int] = list(range(12)) if edge_permutation is None else edge_permutation
+        self.edge_orientation: list[int] = [0] * 12 if edge_orientation is None else edge_orientation
+        self.center_permutation: list[int] = list(range(6)) if center_permutation is None else center_permutation
+
+    @staticmethod
+    def from_cube(cube: Cube, face_colors: dict[FaceID, Color] = None) -> 'CubieCube':
+        """
+        Converts a 3x3 `Cube` to its pieces representation.
+        :param cube: The cube to convert.
+        :param face_colors: The color of each face of the solved cube, which identifies the pieces. Defaults to
+            `ORDERED_COLORS`.
+        :return: The pieces representation of `cube`.
+        :raise ValueError: If the cube is not a 3x3 cube, or if it has a piece which doesn't exist in the solved cube.
+        """
+        if cube.size != 3:
+            raise ValueError(f"Given Cube size is {cube.size} instead of 3.")
+        if face_colors is None:
+            face_colors = ORDERED_COLORS
+
+        face_codes = tuple(COLOR_CODES[face_colors[face_id]] for face_id in FACE_IDS)
+        center_indexes, corner_indexes, edge_indexes = _get_pieces_indexes(face_codes)
+        state = cube.state
+
+        try:
+            center_permutation = [center_indexes[code] for code in _CENTERS_GETTER(state)]
+        except KeyError:
+            raise ValueError("The cube has a center with an unknown color.") from None
+
+        corner_permutation, corner_orientation = [], []
+        for locations, getter in zip(CORNER_LOCATIONS, _CORNER_GETTERS):
+            found = corner_indexes.get(getter(state))
+            if found is None:
+                raise ValueError(f"The corner at {locations} does not exist in the solved cube.")
+            corner_index, rotation = found
+            corner_permutation.append(corner_index)
+            corner_orientation.append((-rotation) % 3)
+
+        edge_permutation, edge_orientation = [], []
+        for locations, getter in zip(EDGE_LOCATIONS, _EDGE_GETTERS):
+            found = edge_indexes.get(getter(state))
+            if found is None:
+                raise ValueError(f"The edge at {locations} does not exist in the solved cube.")
+            edge_permutation.append(found[0])
+            edge_orientation.append(found[1])
+
+        return CubieCube(corner_permutation, corner_orientation, edge_permutation, edge_orientation,
+                         center_permutation)
+
+    @staticmethod
+    def random(generator: random.Random = None) -> 'CubieCube':
+        """
+        Samples a uniformly random cube out of all the cubes which can be reached by moves, without applying moves:
+        the pieces are permuted and oriented at random, and the parities and the orientation sums are fixed to
+        solvable ones (see: `is_solvable`).
+        :param generator: The random number generator to use. The global `random` generator is used if not given.
+        :return: The random cube.
+        """
+        if generator is None:
+            generator = random
+
+        center_permutation = generator.choice(get_center_permutations()).copy()
+        corner_permutation = list(range(8))
+        generator.shuffle(corner_permutation)
+        edge_permutation = list(range(12))
+        generator.shuffle(edge_permutation)
+        if get_permutation_parity(corner_permutation) ^ get_permutation_parity(edge_permutation) != \
+                get_permutation_parity(center_permutation):
+            edge_permutation[-2], edge_permutation[-1] = edge_permutation[-1], edge_permutation[-2]
+
+        corner_orientation = [generator.randrange(3) for _ in range(7)]
+        corner_orientation.append(-sum(corner_orientation) % 3)
+        edge_orientation = [generator.randrange(2) for _ in range(11)]
+        edge_orientation.append(sum(edge_orientation) % 2)
+
+        return CubieCube(corner_permutation, corner_orientation, edge_permutation, edge_orientation,
+                         center_permutation)
+
+    def to_cube(self, face_colors: dict[FaceID, Color] = None) -> Cube:
+        """
+        Converts the pieces representation back to a 3x3 `Cube`.
+        :param face_colors: The color of each face of the solved cube (see: `from_cube`). Defaults to `ORDERED_COLORS`.
+        :return: The cube.
+        """
+        if face_colors is None:
+            face_colors = ORDERED_COLORS
+
+        face_codes = [COLOR_CODES[face_colors[face_id]] for face_id in FACE_IDS]
+        state = bytearray(len(FACE_IDS) * 9)
+
+        for location, face_index in zip(CENTER_LOCATIONS, self.center_permutation):
+            state[location.to_index(3)] = face_codes[face_index]
+
+        for locations, corner_index, orientation in zip(CORNER_LOCATIONS, self.corner_permutation,
+                                                        self.corner_orientation):
+            for i, face_id in enumerate(CORNERS[corner_index]):
+                state[locations[(i + orientation) % 3].to_index(3)] = face_codes[FACE_ID_INDEXES[face_id]]
+
+        for locations, edge_index, orientation in zip(EDGE_LOCATIONS, self.edge_permutation, self.edge_orientation):
+            for i, face_id in enumerate(EDGES[edge_index]):
+                state[locations[(i + orientation) % 2].to_index(3)] = face_codes[FACE_ID_INDEXES[face_id]]
+
+        return Cube(3, state=state)
+
+    def multiply(self, other: 'CubieCube') -> 'CubieCube':
+        """
+        Returns the cube which results from applying the pieces movement of `other` (from the solved cube to `other`)
+        to `self`.
+        """
+        corner_permutation = [self.corner_permutation[i] for i in other.corner_permutation]
+        corner_orientation = [(self.corner_orientation[i] + orientation) % 3
+                              for i, orientation in zip(other.corner_permutation, other.corner_orientation)]
+        edge_permutation = [self.edge_permutation[i] for i in other.edge_permutation]
+        edge_orientation = [self.edge_orientation[i] ^ orientation
+                            for i, orientation in zip(other.edge_permutation, other.edge_orientation)]
+        center_permutation = [self.center_permutation[i] for i in other.center_permutation]
+        return CubieCube(corner_permutation, corner_orientation, edge_permutation, edge_orientation,
+                         center_permutation)
+
+    def inverse(self) -> 'CubieCube':
+        """
+        Returns the cube whose pieces movement cancels the pieces movement of `self`.
+        """
+        inverse = CubieCube()
+        for i, corner_index in enumerate(self.corner_permutation):
+            inverse.corner_permutation[corner_index] = i
+            inverse.corner_orientation[corner_index] = (-self.corner_orientation[i]) % 3
+        for i, edge_index in enumerate(self.edge_permutation):
+            inverse.edge_permutation[edge_index] = i
+            inverse.edge_orientation[edge_index] = self.edge_orientation[i]
+        for i, face_index in enumerate(self.center_permutation):
+            inverse.center_permutation[face_index] = i
+        return inverse
+
+    def move(self, move: Union[Move, BlockMove]) -> None:
+        if isinstance(move, BlockMove):
+            self.execute_moves(move.get_moves())
+            return
+        self._assign(self.multiply(get_move_cubie_cube(move)))
+
+    def execute_moves(self, moves: list[Union[Move, BlockMove]]) -> None:
+        for move in moves:
+            self.move(move)
+
+    def _assign(self, other: 'CubieCube') -> None:
+        self.corner_permutation = other.corner_permutation
+        self.corner_orientation = other.corner_orientation
+        self.edge_permutation = other.edge_permutation
+        self.edge_orientation = other.edge_orientation
+        self.center_permutation = other.center_permutation
+
+    def get_twist(self) -> int:
+        """
+        Returns the sum of the corner orientations modulo 3 (0 for every solvable cube).
+        """
+        return sum(self.corner_orientation) % 3
+
+    def get_flip(self) -> int:
+        """
+        Returns the sum of the edge orientations modulo 2 (0 for every solvable cube).
+        """
+        return sum(self.edge_orientation) % 2
+
+    def get_corner_parity(self) -> int:
+        return get_permutation_parity(self.corner_permutation)
+
+    def get_edge_parity(self) -> int:
+        return get_permutation_parity(self.edge_permutation)
+
+    def get_center_parity(self) -> int:
+        return get_permutation_parity(self.center_permutation)
+
+    def is_solvable(self) -> bool:
+        """
+        Checks whether the cube can be solved by moves: the corners are not twisted, the edges are not flipped and the
+        parities of the permutations match (every quarter turn changes the corners and the edges parities, or the edges
+        and the centers parities).
+        """
+        return (self.get_twist() == 0 and self.get_flip() == 0 and
+                self.get_corner_parity() ^ self.get_edge_parity() == self.get_center_parity())
+
+    def copy(self) -> 'CubieCube':
+        return CubieCube(self.corner_permutation.copy(), self.corner_orientation.copy(),
+                         self.edge_permutation.copy(), self.edge_orientation.copy(), self.center_permutation.copy())
+
+    def __eq__(self, other: 'CubieCube') -> bool:
+        return (self.corner_permutation == other.corner_permutation and
+                self.corner_orientation == other.corner_orientation and
+                self.edge_permutation == other.edge_permutation and self.edge_orientation == other.edge_orientation and
+                self.center_permutation == other.center_permutation)
+
+    def __repr__(self):
+        return (f"CubieCube(corners={list(zip(self.corner_permutation, self.corner_orientation))}, "
+                f"edges={list(zip(self.edge_permutation, self.edge_orientation))}, centers={self.center_permutation})")
+
+
+def get_permutation_parity(permutation: list[int]) -> int:
+    """
+    Returns 0 for an even permutation and 1 for an odd permutation.
+    """
+    parity = 0
+    visited = [False] * len(permutation)
+    for start in range(len(permutation)):
+        if visited[start]:
+            continue
+        i = start
+        while not visited[i]:
+            visited[i] = True
+            i = permutation[i]
+            parity ^= 1
+        parity ^= 1  # a cycle of length k is k - 1 transpositions
+    return parity
+
+
+_move_cubie_cubes: list[CubieCube] = []
+
+
+def get_move_cubie_cube(move: Move) -> CubieCube:
+    """
+    Returns the pieces movement of a 3x3 move, as the cube which results from applying the move to the solved cube.
+    """
+    if not _move_cubie_cubes:
+        for code in range(len(ORIENTATIONS) * 3 * 2):
+            cube = Cube(3)
+            cube.move(Move.from_code(code))
+            _move_cubie_cubes.append(CubieCube.from_cube(cube))
+    return _move_cubie_cubes[move.code]
+
+
+_center_permutations: list[list[int]] = []
+
+
+def get_center_permutations() -> list[list[int]]:
+    """
+    Returns the 24 center permutations which can be reached by moves (one per orientation of the whole cube).
+    """
+    if not _center_permutations:
+        _center_permutations.append(list(range(6)))
+        move_permutations = [get_move_cubie_cube(Move.from_code(code)).center_permutation
+                             for code in range(len(ORIENTATIONS) * 3 * 2)]
+        for center_permutation in _center_permutations:  # a breadth-first search, which extends the list it iterates
+            for move_permutation in move_permutations:
+                new_permutation = [center_permutation[i] for i in move_permutation]
+                if new_permutation not in _center_permutations:
+                    _center_permutations.append(new_permutation)
+    return _center_permutations
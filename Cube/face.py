@@ -1,15 +1,206 @@
-from Cube.color import Color
+import weakref
+
+from Cube.color import Color, COLORS, COLOR_CODES
 from Cube.face_id import FaceID
 from Cube.index_translator import IndexTranslator, TOP_DOWN, BOTTOM_UP, LEFT_RIGHT, RIGHT_LEFT
 from Cube.orientation import Orientation
 
 
+class FaceRow:
+    """
+    A view of a single row of a `Face`. Reading and writing a `FaceRow` reads and writes the face's buffer directly.
+    """
+    __slots__ = ("face", "start", "step", "size")
+
+    def __init__(self, face: 'Face', start: int, step: int, size: int):
+        self.face: Face = face
+        self.start: int = start
+        self.step: int = step
+        self.size: int = size
+
+    def _get_buffer_index(self, col: int) -> int:
+        if col < 0:
+            col += self.size
+        if not 0 <= col < self.size:
+            raise IndexError("Face row index out of range.")
+        return self.start + col * self.step
+
+    def __getitem__(self, col):
+        if isinstance(col, slice):
+            return list(self)[col]
+        return COLORS[self.face.buffer[self._get_buffer_index(col)]]
+
+    def __setitem__(self, col: int, color: Color):
+        self.face.prepare_write()
+        self.face.buffer[self._get_buffer_index(col)] = COLOR_CODES[color]
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        buffer = self.face.buffer
+        return (COLORS[buffer[self.start + col * self.step]] for col in range(self.size))
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
 class Face:
-    def __init__(self, size: int, face_id: FaceID, stickers: list[list[Color]]):
+    def __init__(self, size: int, face_id: FaceID, stickers: list[list[Color]] = None, buffer: bytearray = None,
+                 offset: int = 0, rotations: bytearray = None, rotation_index: int = 0, owner=None):
+        """
+        A face of a `Cube`. The stickers of the face are stored as color codes (see: `Cube.color.COLOR_CODES`), row
+        after row, in `size * size` consecutive bytes of `buffer` starting at `offset`. A `Cube` keeps all of its
+        faces in a single buffer, so its faces are views of that buffer.
+
+        Rotating the face does not move its stickers in the buffer: it only counts the clockwise quarter turns the face
+        went through since its stickers were last laid out (its rotation), and every access to the stickers is remapped
+        by it. `materialize` lays the stickers out again.
+        :param size: The number of stickers in a row.
+        :param face_id: The id of the face.
+        :param stickers: Initial stickers of the face. Written to the buffer if given.
+        :param buffer: The buffer to store the stickers in. A new buffer is allocated if not given.
+        :param offset: The index of the face's first sticker in `buffer`.
+        :param rotations: The buffer to store the rotation of the face in (which may be shared by the faces of a cube).
+            A new buffer is allocated if not given.
+        :param rotation_index: The index of the face's rotation in `rotations`.
+        :param owner: The `Cube` whose buffer is `buffer`, which is notified before the face writes to the buffer
+            (see: `prepare_write`).
+        """
         self.size: int = size
         self.face_id: FaceID = face_id
 
-        self.stickers = stickers
+        if buffer is None:
+            buffer = bytearray(size * size)
+            offset = 0
+        self.buffer: bytearray = buffer
+        self.offset: int = offset
+
+        if rotations is None:
+            rotations = bytearray(1)
+            rotation_index = 0
+        self.rotations: bytearray = rotations
+        self.rotation_index: int = rotation_index
+        self.owner = weakref.ref(owner) if owner is not None else None  # weak, to avoid a reference cycle
+        # (orientation, rotation) -> (start of strip 0, start difference between adjacent strips, step)
+        self._strip_lines: dict[tuple[Orientation, int], tuple[int, int, int]] = {}
+
+        if stickers is not None:
+            self.stickers = stickers
+
+    @property
+    def rotation(self) -> int:
+        """
+        The number of clockwise quarter turns of the face which are not applied to its buffer yet.
+        """
+        return self.rotations[self.rotation_index]
+
+    @property
+    def stickers(self) -> list[list[Color]]:
+        """
+        A copy of the face's stickers as a list of rows.
+        """
+        return [list(self[row]) for row in range(self.size)]
+
+    @stickers.setter
+    def stickers(self, stickers: list[list[Color]]) -> None:
+        codes = bytes(COLOR_CODES[color] for row in stickers for color in row)
+        if len(codes) != self.size * self.size:
+            raise ValueError(f"Expected {self.size * self.size} stickers, got {len(codes)}.")
+        self.prepare_write()
+        self.buffer[self.offset:self.offset + len(codes)] = codes
+        self.rotations[self.rotation_index] = 0
+
+    def get_codes(self) -> bytes:
+        """
+        Returns the color codes of the face's stickers, row after row.
+        """
+        if self.rotation == 0:
+            return bytes(self.buffer[self.offset:self.offset + self.size * self.size])
+        return b"".join(self.buffer[self._get_row_slice(row)] for row in range(self.size))
+
+    def materialize(self) -> None:
+        """
+        Lays the stickers out in the buffer by the face's rotation, so the face's rotation becomes 0.
+        """
+        if self.rotation != 0:
+            codes = self.get_codes()
+            self.prepare_write()
+            self.buffer[self.offset:self.offset + self.size * self.size] = codes
+            self.rotations[self.rotation_index] = 0
+
+    def prepare_write(self) -> None:
+        """
+        Must be called before writing to `self.buffer`, to let the owner cube stop sharing its buffer with its copies
+        (see: `Cube.copy`).
+        """
+        owner = self.owner() if self.owner is not None else None
+        if owner is not None:
+            owner.detach_state()
+
+    def bind(self, buffer: bytearray, offset: int, rotations: bytearray = None, rotation_index: int = 0,
+             owner=None) -> None:
+        """
+        Moves the stickers of the face into `buffer` (starting at `offset`) and makes the face a view of it.
+        :param buffer: The new buffer of the face.
+        :param offset: The index of the face's first sticker in `buffer`.
+        :param rotations: The new buffer of the face's rotation. A new buffer is allocated if not given.
+        :param rotation_index: The index of the face's rotation in `rotations`.
+        :param owner: The `Cube` whose buffer is `buffer` (see: `Face`).
+        """
+        buffer[offset:offset + self.size * self.size] = self.get_codes()
+        self.buffer = buffer
+        self.offset = offset
+
+        if rotations is None:
+            rotations = bytearray(1)
+            rotation_index = 0
+        rotations[rotation_index] = 0
+        self.rotations = rotations
+        self.rotation_index = rotation_index
+        self.owner = weakref.ref(owner) if owner is not None else None
+        self._strip_lines.clear()
+
+    def set_layout(self, offset: int, rotation_index: int) -> None:
+        """
+        Makes the face a view of other stickers of its buffer (see: `Cube.reorient`).
+        :param offset: The index of the face's first sticker in `self.buffer`.
+        :param rotation_index: The index of the face's rotation in `self.rotations`.
+        """
+        self.offset = offset
+        self.rotation_index = rotation_index
+        self._strip_lines.clear()
+
+    def get_buffer_index(self, row: int, col: int) -> int:
+        """
+        Returns the index of the sticker at (`row`, `col`) in `self.buffer`.
+        """
+        last = self.size - 1
+        rotation = self.rotations[self.rotation_index]
+        if rotation == 1:
+            row, col = last - col, row
+        elif rotation == 2:
+            row, col = last - row, last - col
+        elif rotation == 3:
+            row, col = col, last - row
+        return self.offset + row * self.size + col
+
+    def _get_line_slice(self, first: tuple[int, int], last: tuple[int, int]) -> slice:
+        """
+        Returns the slice of `self.buffer` which iterates the stickers of a line of the face (a row, a column, or any of
+        them reversed), from its `first` (row, col) to its `last` (row, col).
+        """
+        start = self.get_buffer_index(*first)
+        end = self.get_buffer_index(*last)
+        step = (end - start) // (self.size - 1) if self.size > 1 else 1
+        stop = end + step
+        return slice(start, stop if stop >= 0 else None, step)
+
+    def _get_row_slice(self, row: int) -> slice:
+        return self._get_line_slice((row, 0), (row, self.size - 1))
 
     def get_strip_index_translator(self, orientation: Orientation, index: int) -> IndexTranslator:
         """
@@ -60,19 +251,37 @@ class Face:
         else:
             raise ValueError(Orientation.not_recognized_orientation_error_msg(orientation))
 
-    def get_strip(self, orientation: Orientation, index) -> list[Color]:
-        strip = []
+    def get_strip_slice(self, orientation: Orientation, index: int) -> slice:
+        """
+        Returns the slice of `self.buffer` which iterates the specified strip in the order of its indices.
+        :param orientation: Which strip orientation to return (see: `get_strip_index_translator`).
+        :param index: The index of the strip in the face (see: `get_strip_index_translator`).
+        :return: The slice of `self.buffer` which iterates the specified strip.
+        """
+        # the strips of an orientation are parallel, so the start of a strip is linear in its index
+        key = (orientation, self.rotations[self.rotation_index])
+        strip_line = self._strip_lines.get(key)
+        if strip_line is None:
+            first_slice = self._compute_strip_slice(orientation, 0)
+            second_start = self._compute_strip_slice(orientation, 1).start if self.size > 1 else first_slice.start
+            strip_line = self._strip_lines[key] = (first_slice.start, second_start - first_slice.start,
+                                                   first_slice.step)
+
+        first_start, strips_distance, step = strip_line
+        start = first_start + strips_distance * index
+        stop = start + step * self.size
+        return slice(start, stop if stop >= 0 else None, step)
+
+    def _compute_strip_slice(self, orientation: Orientation, index: int) -> slice:
         index_translator = self.get_strip_index_translator(orientation, index)
-        for i in range(self.size):
-            row, col = index_translator.translate(i)
-            strip.append(self.stickers[row][col])
-        return strip
+        return self._get_line_slice(index_translator.translate(0), index_translator.translate(self.size - 1))
+
+    def get_strip(self, orientation: Orientation, index) -> list[Color]:
+        return [COLORS[code] for code in self.buffer[self.get_strip_slice(orientation, index)]]
 
     def set_strip(self, orientation: Orientation, index, new_strip) -> None:
-        index_translator = self.get_strip_index_translator(orientation, index)
-        for i in range(self.size):
-            row, col = index_translator.translate(i)
-            self.stickers[row][col] = new_strip[i]
+        self.prepare_write()
+        self.buffer[self.get_strip_slice(orientation, index)] = bytes(COLOR_CODES[color] for color in new_strip)
 
     def find_move_index_from_real_indices(self, move_orientation: Orientation, row: int, col: int) -> int:
         illegal_face_id_for_orientation = False
@@ -116,38 +325,49 @@ class Face:
 
     def rotate_face(self, clockwise: bool):
         """
-        90 degrees rotation of `self.stickers`.
+        90 degrees rotation of the face's stickers. Takes O(1), since the stickers are not moved in the buffer (see:
+        `Face`).
         """
-        stickers = self.stickers
-
-        if clockwise:
-            stickers = stickers[::-1]  # reverse rows
-            stickers = [list(row) for row in zip(*stickers)]  # transpose
-        else:
-            stickers = [list(row) for row in zip(*stickers)]  # transpose
-            stickers = stickers[::-1]  # reverse rows
-
-        self.stickers = stickers
+        self.rotations[self.rotation_index] = (self.rotation + (1 if clockwise else 3)) % 4
 
     def copy(self) -> 'Face':
-        stickers_copy = []
-        for row in self.stickers:
-            stickers_copy.append(row.copy())
+        return Face(self.size, self.face_id, buffer=bytearray(self.get_codes()))
 
-        return Face(self.size, self.face_id, stickers_copy)
+    def copy_view(self, rotations: bytearray, owner) -> 'Face':
+        """
+        Returns a face which is a view of the same stickers of the same buffer (see: `Cube.copy`), without copying
+        them.
+        :param rotations: The buffer of the rotation of the new face, which has its rotation at `self.rotation_index`.
+        :param owner: The `Cube` of the new face (see: `Face`).
+        """
+        face = Face.__new__(Face)
+        face.size = self.size
+        face.face_id = self.face_id
+        face.buffer = self.buffer
+        face.offset = self.offset
+        face.rotations = rotations
+        face.rotation_index = self.rotation_index
+        face.owner = weakref.ref(owner)
+        face._strip_lines = self._strip_lines.copy()  # the strips depend only on the layout of the face
+        return face
 
     @staticmethod
     def _error_message_illegal_face_id_for_orientation(face_id: FaceID, required_orientation: Orientation) -> str:
         return f"The face {face_id.name!r} does not support {required_orientation.name!r} orientation."
 
-    def __getitem__(self, item: int) -> list[Color]:
-        return self.stickers[item]
+    def __getitem__(self, item: int) -> FaceRow:
+        if item < 0:
+            item += self.size
+        if not 0 <= item < self.size:
+            raise IndexError("Face index out of range.")
+        row_slice = self._get_row_slice(item)
+        return FaceRow(self, row_slice.start, row_slice.step, self.size)
 
     def __eq__(self, other: 'Face'):
-        return self.stickers == other.stickers
+        return self.size == other.size and self.get_codes() == other.get_codes()
 
     def __repr__(self):
         string = f"{self.face_id.name} Face:\n"
         for row in range(self.size):
-            string += f"\t{self.stickers[row]}\n"
+            string += f"\t{self[row]}\n"
         return string
@@ -48,3 +48,6 @@ class FaceID(Enum):
 
 
 RING_FACE_IDS = [FaceID.F, FaceID.R, FaceID.B, FaceID.L]
+
+FACE_IDS: list[FaceID] = list(FaceID)  # the order of the faces in a `Cube` state
+FACE_ID_INDEXES: dict[FaceID, int] = {face_id: i for i, face_id in enumerate(FACE_IDS)}
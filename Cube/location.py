@@ -1,14 +1,59 @@
-from Cube.face_id import FaceID
+from Cube.face_id import FaceID, FACE_IDS, FACE_ID_INDEXES
 
 
 class Location:
-    def __init__(self, face_id: FaceID, row: int, col: int):
-        self.face_id: FaceID = face_id
-        self.row: int = row
-        self.col: int = col
+    """
+    An immutable sticker location. Locations are interned: creating a location which equals an existing location
+    returns the existing object, so locations can be compared by identity and used as cheap dictionary keys.
+    """
+    __slots__ = ("face_id", "row", "col", "_hash")
+
+    _instances: dict[tuple[FaceID, int, int], 'Location'] = dict()
+
+    def __new__(cls, face_id: FaceID, row: int, col: int):
+        location = Location._instances.get((face_id, row, col))
+        if location is not None:
+            return location
+
+        row, col = int(row), int(col)
+        location = Location._instances.get((face_id, row, col))
+        if location is None:
+            location = super().__new__(cls)
+            object.__setattr__(location, "face_id", face_id)
+            object.__setattr__(location, "row", row)
+            object.__setattr__(location, "col", col)
+            object.__setattr__(location, "_hash", hash((face_id, row, col)))
+            Location._instances[(face_id, row, col)] = location
+        return location
+
+    def to_index(self, size: int) -> int:
+        """
+        Returns the index of the location's sticker in the state of a `size`x`size` cube (see: `Cube.state`).
+        """
+        return (FACE_ID_INDEXES[self.face_id] * size + self.row) * size + self.col
+
+    @staticmethod
+    def from_index(index: int, size: int) -> 'Location':
+        """
+        Returns the location of the `index`-th sticker in the state of a `size`x`size` cube (see: `Cube.state`).
+        """
+        face_index, face_sticker_index = divmod(index, size * size)
+        row, col = divmod(face_sticker_index, size)
+        return Location(FACE_IDS[face_index], row, col)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def __reduce__(self):
+        return Location, (self.face_id, self.row, self.col)
 
     def __eq__(self, location: 'Location') -> bool:
+        if not isinstance(location, Location):
+            return NotImplemented
         return self.face_id is location.face_id and self.row == location.row and self.col == location.col
 
+    def __hash__(self):
+        return self._hash
+
     def __repr__(self):
         return f"{self.face_id.name}({self.row}, {self.col})"
@@ -1,17 +1,54 @@
-from Cube.orientation import Orientation
+from typing import Union
+
+from Cube.orientation import Orientation, ORIENTATIONS, ORIENTATION_INDEXES
 
 
 class Move:
-    def __init__(self, orientation: Orientation, index: int, is_forward: bool):
-        self.orientation: Orientation = orientation
-        self.index: int = index
-        self.is_forward: bool = is_forward
+    """
+    An immutable move. Moves are interned: creating a move which equals an existing move returns the existing
+    object, so moves can be compared by identity and used as cheap dictionary keys.
+    """
+    __slots__ = ("orientation", "index", "is_forward", "code")
+
+    _instances: dict[tuple[Orientation, int, bool], 'Move'] = dict()
+
+    def __new__(cls, orientation: Orientation, index: int, is_forward: bool):
+        move = Move._instances.get((orientation, index, is_forward))
+        if move is not None:
+            return move
+
+        index, is_forward = int(index), bool(is_forward)
+        move = Move._instances.get((orientation, index, is_forward))
+        if move is None:
+            move = super().__new__(cls)
+            object.__setattr__(move, "orientation", orientation)
+            object.__setattr__(move, "index", index)
+            object.__setattr__(move, "is_forward", is_forward)
+            object.__setattr__(move, "code", Move.encode(orientation, index, is_forward))
+            Move._instances[(orientation, index, is_forward)] = move
+        return move
+
+    @staticmethod
+    def encode(orientation: Orientation, index: int, is_forward: bool) -> int:
+        """
+        Returns the integer code of a move. The codes of the moves of a `size`x`size` cube are `0, ..., 6 * size - 1`.
+        """
+        return (index * len(ORIENTATIONS) + ORIENTATION_INDEXES[orientation]) * 2 + (not is_forward)
+
+    @staticmethod
+    def from_code(code: int) -> 'Move':
+        """
+        Returns the move whose integer code is `code` (see: `encode`).
+        """
+        code, is_backward = divmod(code, 2)
+        index, orientation_index = divmod(code, len(ORIENTATIONS))
+        return Move(ORIENTATIONS[orientation_index], index, not is_backward)
 
     def reversed(self) -> 'Move':
         return Move(self.orientation, self.index, not self.is_forward)
 
     @staticmethod
-    def get_inverted_moves(moves: list['Move']) -> list['Move']:
+    def get_inverted_moves(moves: list[Union['Move', 'BlockMove']]) -> list[Union['Move', 'BlockMove']]:
         """
         Calculates the sequence of moves which inverts the effect of a given moves list.
         :param moves: A list of moves to invert.
@@ -19,12 +56,120 @@ class Move:
         """
         return [moves[-i - 1].reversed() for i in range(len(moves))]
 
+    @staticmethod
+    def simplify(moves: list[Union['Move', 'BlockMove']]) -> list['Move']:
+        """
+        Calculates a canonical short sequence of moves which has the same effect as a given moves list, in linear time.
+        Runs of moves of the same orientation commute, so each run is merged into at most one quarter turn (or two
+        moves for a half turn) per index, ordered by index. Runs which cancel out entirely are removed, which may merge
+        their neighbouring runs. Block moves (see: `BlockMove`) are split into their single slice moves.
+        :param moves: A list of moves to simplify.
+        :return: A list of moves that has the same effect as `moves`.
+        """
+        runs: list[tuple[Orientation, dict[int, int]]] = []  # orientation and quarter turns per index of each run
+
+        for move in Move.expand_blocks(moves):
+            quarter_turns = 1 if move.is_forward else 3
+
+            if runs and runs[-1][0] is move.orientation:
+                run_turns = runs[-1][1]
+                quarter_turns = (run_turns.get(move.index, 0) + quarter_turns) % 4
+                if quarter_turns:
+                    run_turns[move.index] = quarter_turns
+                else:
+                    del run_turns[move.index]
+                    if not run_turns:
+                        runs.pop()
+            else:
+                runs.append((move.orientation, {move.index: quarter_turns}))
+
+        simplified: list[Move] = []
+        for orientation, run_turns in runs:
+            for index in sorted(run_turns):
+                quarter_turns = run_turns[index]
+                if quarter_turns == 3:
+                    simplified.append(Move(orientation, index, False))
+                else:
+                    simplified.extend(Move(orientation, index, True) for _ in range(quarter_turns))
+
+        return simplified
+
+    @staticmethod
+    def expand_blocks(moves: list[Union['Move', 'BlockMove']]) -> list['Move']:
+        """
+        Returns the moves with every block move (see: `BlockMove`) replaced by its single slice moves.
+        """
+        expanded: list[Move] = []
+        for move in moves:
+            if isinstance(move, BlockMove):
+                expanded.extend(move.get_moves())
+            else:
+                expanded.append(move)
+        return expanded
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def __reduce__(self):
+        return Move, (self.orientation, self.index, self.is_forward)
+
     def __eq__(self, other: 'Move') -> bool:
-        return (self.orientation is other.orientation and self.index == other.index and
-                self.is_forward == other.is_forward)
+        if not isinstance(other, Move):
+            return NotImplemented
+        return self.code == other.code
+
+    def __hash__(self):
+        return self.code
 
     def __repr__(self):
         string = f"{self.orientation.name}{self.index}"
         if not self.is_forward:
             string += "b"
         return string
+
+
+class BlockMove:
+    """
+    An immutable move of the consecutive slices `first_index, ..., last_index` of an orientation together, in the same
+    direction (such as a wide move). A block move of all the slices of a cube rotates the whole cube.
+    """
+    __slots__ = ("orientation", "first_index", "last_index", "is_forward")
+
+    def __init__(self, orientation: Orientation, first_index: int, last_index: int, is_forward: bool):
+        if not 0 <= first_index <= last_index:
+            raise ValueError(f"Illegal slices range: {first_index} to {last_index}.")
+        object.__setattr__(self, "orientation", orientation)
+        object.__setattr__(self, "first_index", int(first_index))
+        object.__setattr__(self, "last_index", int(last_index))
+        object.__setattr__(self, "is_forward", bool(is_forward))
+
+    def get_moves(self) -> list[Move]:
+        """
+        Returns the single slice moves which have the same effect as the block move.
+        """
+        return [Move(self.orientation, index, self.is_forward)
+                for index in range(self.first_index, self.last_index + 1)]
+
+    def reversed(self) -> 'BlockMove':
+        return BlockMove(self.orientation, self.first_index, self.last_index, not self.is_forward)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def __reduce__(self):
+        return BlockMove, (self.orientation, self.first_index, self.last_index, self.is_forward)
+
+    def __eq__(self, other: 'BlockMove') -> bool:
+        if not isinstance(other, BlockMove):
+            return NotImplemented
+        return (self.orientation is other.orientation and self.first_index == other.first_index and
+                self.last_index == other.last_index and self.is_forward == other.is_forward)
+
+    def __hash__(self):
+        return hash((self.orientation, self.first_index, self.last_index, self.is_forward))
+
+    def __repr__(self):
+        string = f"{self.orientation.name}{self.first_index}-{self.last_index}"
+        if not self.is_forward:
+            string += "b"
+        return string
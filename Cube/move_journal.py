@@ -0,0 +1,60 @@
+from typing import Union
+
+from Cube.move import Move, BlockMove
+from Cube.permutation import Permutation
+from Cube.symmetry import Symmetry
+
+JournalStep = Union[Move, BlockMove, Permutation, Symmetry]
+
+
+class Checkpoint:
+    def __init__(self, steps: int, forks: int):
+        """
+        A point of a journal's history (see: `MoveJournal.checkpoint`).
+        :param steps: The number of steps which were done at the point.
+        :param forks: The number of times the journal had discarded undone steps at the point.
+        """
+        self.steps: int = steps
+        self.forks: int = forks
+
+    def __repr__(self):
+        return f"Checkpoint({self.steps}, {self.forks})"
+
+
+class MoveJournal:
+    def __init__(self):
+        """
+        A history of the steps applied to a cube: moves, compiled sequences of moves (see: `Cube.compile_moves`) and
+        rotations of the whole cube (see: `Cube.reorient`).
+        Moves are interned, so each step takes a single reference. Steps which were undone are kept for redoing until
+        a new step is recorded.
+        """
+        self.done: list[JournalStep] = []
+        self.undone: list[JournalStep] = []
+        self.fork_steps: list[int] = []  # the number of done steps at each time that undone steps were discarded
+
+    def record(self, step: JournalStep) -> None:
+        if self.undone:
+            self.undone.clear()
+            self.fork_steps.append(len(self.done))
+        self.done.append(step)
+
+    def checkpoint(self) -> Checkpoint:
+        return Checkpoint(len(self.done), len(self.fork_steps))
+
+    def is_in_history(self, checkpoint: Checkpoint) -> bool:
+        """
+        Returns whether the steps done before `checkpoint` are still the first done steps (they may be undone). This
+        is false once some of them were undone and other steps were recorded instead.
+        """
+        return all(fork_steps >= checkpoint.steps for fork_steps in self.fork_steps[checkpoint.forks:])
+
+    def copy(self) -> 'MoveJournal':
+        journal = MoveJournal()
+        journal.done = self.done.copy()
+        journal.undone = self.undone.copy()
+        journal.fork_steps = self.fork_steps.copy()
+        return journal
+
+    def __len__(self):
+        return len(self.done)
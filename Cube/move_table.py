@@ -0,0 +1,76 @@
+from functools import lru_cache
+
+from Cube.face_id import FACE_IDS
+from Cube.move import Move
+from Cube.orientation import ORIENTATIONS
+from Cube.permutation import Permutation
+
+COMPILED_SEQUENCES_CACHE_SIZE = 4096
+MOVE_TABLE_MAX_SIZE = 10  # bigger cubes move faster strip by strip than by an O(size^2) permutation per move
+
+
+class MoveTable:
+    """
+    The sticker permutations (see: `Permutation`) of the moves of a `size`x`size` cube, so applying a move is a single
+    gather over the cube state. Permutations are compiled on the first use of each move.
+    """
+    _tables: dict[int, 'MoveTable'] = dict()
+
+    def __init__(self, size: int):
+        self.size: int = size
+        self.stickers_number: int = len(FACE_IDS) * size * size
+
+        self._permutations: list[Permutation] = [None] * (len(ORIENTATIONS) * size * 2)  # by move code
+        self._compile_sequence = lru_cache(maxsize=COMPILED_SEQUENCES_CACHE_SIZE)(self._compile_sequence)
+
+    @staticmethod
+    def get(size: int) -> 'MoveTable':
+        """
+        Returns the (cached) move table of `size`x`size` cubes.
+        """
+        table = MoveTable._tables.get(size)
+        if table is None:
+            table = MoveTable(size)
+            MoveTable._tables[size] = table
+        return table
+
+    def get_permutation(self, move: Move) -> Permutation:
+        """
+        Returns the sticker permutation of `move`.
+        """
+        permutation = self._permutations[move.code]
+        if permutation is None:
+            permutation = self._compile(move)
+            self._permutations[move.code] = permutation
+        return permutation
+
+    def compile(self, moves: list[Move]) -> Permutation:
+        """
+        Composes a sequence of moves into a single permutation, which has the effect of applying all of `moves` in
+        order. Compiled sequences are cached, and equivalent sequences are compiled into equal permutations.
+        :param moves: The moves to compile (which may include block moves, see: `BlockMove`).
+        :return: The permutation of the sequence.
+        """
+        return self._compile_sequence(tuple(move.code for move in Move.expand_blocks(moves)))
+
+    def _compile_sequence(self, codes: tuple[int, ...]) -> Permutation:
+        permutation = Permutation.identity(self.stickers_number)
+        for code in codes:
+            permutation = permutation.then(self.get_permutation(Move.from_code(code)))
+        return permutation
+
+    def _compile(self, move: Move) -> Permutation:
+        """
+        Finds the permutation of `move` by applying it strip by strip to cubes whose stickers are the sticker indexes
+        (byte by byte, since a sticker holds a single byte).
+        """
+        from Cube.cube import Cube
+
+        permutation = [0] * self.stickers_number
+        for shift in range(0, max(self.stickers_number - 1, 1).bit_length(), 8):
+            cube = Cube(self.size, state=bytearray((i >> shift) & 0xff for i in range(self.stickers_number)))
+            cube.move_strips(move)
+            for i, index_byte in enumerate(cube.state):
+                permutation[i] |= index_byte << shift
+
+        return Permutation(tuple(permutation))
@@ -0,0 +1,331 @@
+import multiprocessing
+import os
+import time
+from array import array
+from functools import lru_cache
+from multiprocessing.sharedctypes import Synchronized
+from multiprocessing.synchronize import Event
+from typing import Optional
+
+from Cube.color import Color
+from Cube.coordinates import CORNER_PERMUTATION_MOVE_TABLE, FACE_TURNS_NUMBER, FLIP_MOVE_TABLE, SLICES_NUMBER, \
+    SLICE_MOVE_TABLE, TWIST_MOVE_TABLE, build_pruning_table, get_face, get_face_turn_cubie_cubes, \
+    get_face_turn_moves, get_flip, get_permutation_rank, get_slice, get_twist
+from Cube.cube import Cube
+from Cube.cubie_cube import CubieCube
+from Cube.face_id import FaceID, FACE_IDS
+from Cube.move import Move
+from Cube.orientation import Orientation
+from Cube.solver import Solver
+from Cube.symmetry import SYMMETRIES, Symmetry, WHOLE_CUBE_ROTATIONS
+from Cube.table_store import Table, TableSpec, TableStore
+from Cube.two_phase_solver import FLIP_SLICE_PRUNING_TABLE, TWIST_SLICE_PRUNING_TABLE
+from Cube.validator import validate_cube
+
+MAX_OPTIMAL_LENGTH = 20  # every cube can be solved by 20 face turns
+STOP_CHECK_NODES = 4096  # the number of nodes a search expands between checks of its stop conditions
+
+# The rotations of the whole cube which bring the U and D faces, the R and L faces and the F and B faces to the U and
+# D faces. The heuristic of a cube is taken on the cube seen from each of these (which is as strong as three tables).
+AXIS_ROTATIONS: list[Symmetry] = [SYMMETRIES[0], WHOLE_CUBE_ROTATIONS[(Orientation.Z, True)],
+                                  WHOLE_CUBE_ROTATIONS[(Orientation.Y, True)]]
+
+
+def _build_corner_permutation_pruning_table(corner_permutation_move: Table) -> bytearray:
+    # a pair with a constant second coordinate
+    return build_pruning_table(corner_permutation_move, array('H', [0] * FACE_TURNS_NUMBER), 1, 0,
+                               list(range(FACE_TURNS_NUMBER)))
+
+
+CORNER_PERMUTATION_PRUNING_TABLE = TableSpec("corner_permutation_pruning", 1, _build_corner_permutation_pruning_table,
+                                             (CORNER_PERMUTATION_MOVE_TABLE.name,))
+OPTIMAL_TABLES: list[TableSpec] = [
+    TWIST_MOVE_TABLE, FLIP_MOVE_TABLE, SLICE_MOVE_TABLE, CORNER_PERMUTATION_MOVE_TABLE, TWIST_SLICE_PRUNING_TABLE,
+    FLIP_SLICE_PRUNING_TABLE, CORNER_PERMUTATION_PRUNING_TABLE]
+
+
+@lru_cache(maxsize=None)
+def get_axis_turns() -> list[list[int]]:
+    """
+    Returns, for each of `AXIS_ROTATIONS`, the face turn of the rotated cube which has the effect of each face turn
+    of the cube.
+    """
+    cube = Cube(3, state=bytearray(range(len(FACE_IDS) * 9)))  # every sticker is distinct
+    axis_turns = []
+    for rotation in AXIS_ROTATIONS:
+        rotated_turn_states = []
+        for turn in range(FACE_TURNS_NUMBER):
+            rotated_cube = cube.get_symmetric(rotation)
+            rotated_cube.execute_moves(get_face_turn_moves(turn))
+            rotated_turn_states.append(rotated_cube.state)
+
+        turns = []
+        for turn in range(FACE_TURNS_NUMBER):
+            turned_cube = cube.copy()
+            turned_cube.execute_moves(get_face_turn_moves(turn))
+            turns.append(rotated_turn_states.index(turned_cube.get_symmetric(rotation).state))
+        axis_turns.append(turns)
+    return axis_turns
+
+
+def _get_next_turns() -> list[list[int]]:
+    """
+    Returns the turns which may follow a turn of each face, and then the turns which may start a search (at index -1).
+    Turns of a face are merged, and turns of opposite faces (which commute) are kept in a single order.
+    """
+    return [[turn for turn in range(FACE_TURNS_NUMBER) if get_face(turn) != last_face and
+             not (last_face % 2 == 1 and get_face(turn) == last_face - 1)]
+            for last_face in list(range(len(FACE_IDS))) + [-1]]
+
+
+_NEXT_TURNS: list[list[int]] = _get_next_turns()
+
+
+class _SearchStopped(Exception):
+    pass
+
+
+class _Search:
+    def __init__(self, tables: dict[str, Table], cubie_cube: CubieCube, coordinates: tuple[int, ...],
+                 stop_event: Event, nodes: Synchronized, node_budget: Optional[int], deadline: Optional[float]):
+        """
+        A depth-first search for solutions of a given length, which can run in a process of a pool. It stops when
+        `stop_event` is set, when the nodes expanded by all the searches reach `node_budget`, or at `deadline` (a
+        `time.time()` value).
+        :param tables: The tables of `OPTIMAL_TABLES`.
+        :param cubie_cube: The cube to solve.
+        :param coordinates: The coordinates of the cube (see: `OptimalSolver.get_coordinates`).
+        :param nodes: A shared counter of the nodes expanded by all the searches.
+        """
+        self.twist_move: Table = tables[TWIST_MOVE_TABLE.name]
+        self.flip_move: Table = tables[FLIP_MOVE_TABLE.name]
+        self.slice_move: Table = tables[SLICE_MOVE_TABLE.name]
+        self.corner_permutation_move: Table = tables[CORNER_PERMUTATION_MOVE_TABLE.name]
+        self.twist_slice_pruning: Table = tables[TWIST_SLICE_PRUNING_TABLE.name]
+        self.flip_slice_pruning: Table = tables[FLIP_SLICE_PRUNING_TABLE.name]
+        self.corner_permutation_pruning: Table = tables[CORNER_PERMUTATION_PRUNING_TABLE.name]
+        self.axis_turns: list[list[int]] = get_axis_turns()
+
+        self.cubie_cube: CubieCube = cubie_cube
+        self.coordinates: tuple[int, ...] = coordinates
+        self.stop_event: Event = stop_event
+        self.nodes: Synchronized = nodes
+        self.node_budget: Optional[int] = node_budget
+        self.deadline: Optional[float] = deadline
+
+        self._turns: list[int] = []
+        self._unchecked_nodes: int = 0
+
+    def search_branch(self, turn: int, length: int) -> tuple[Optional[list[int]], bool]:
+        """
+        Searches for solutions of `length` turns which start by `turn`.
+        :return: The turns of a solution (or None), and whether the search was completed (and not stopped).
+        """
+        self._turns = []
+        if self._count_nodes():
+            return None, False
+        try:
+            if self._search(*self.coordinates, length, turn):
+                return self._turns, True
+        except _SearchStopped:
+            return None, False
+        finally:
+            self._count_nodes()
+        return None, True
+
+    def _search(self, twist: int, flip: int, slice_coordinate: int, x_twist: int, x_flip: int, x_slice: int,
+                z_twist: int, z_flip: int, z_slice: int, corners: int, togo: int, turn: int) -> bool:
+        """
+        Applies `turn` to the cube of the coordinates (the twist, the flip and the slice coordinates seen from each of
+        `AXIS_ROTATIONS`, and the corner permutation) and searches for solutions of exactly `togo` turns which start by
+        it, after `self._turns`.
+        :return: Whether a solution was found (which is left in `self._turns`).
+        """
+        self._unchecked_nodes += 1
+        if self._unchecked_nodes >= STOP_CHECK_NODES and self._count_nodes():
+            raise _SearchStopped()
+
+        twist = self.twist_move[twist * FACE_TURNS_NUMBER + turn]
+        slice_coordinate = self.slice_move[slice_coordinate * FACE_TURNS_NUMBER + turn]
+        if self.twist_slice_pruning[twist * SLICES_NUMBER + slice_coordinate] >= togo:
+            return False
+        flip = self.flip_move[flip * FACE_TURNS_NUMBER + turn]
+        if self.flip_slice_pruning[flip * SLICES_NUMBER + slice_coordinate] >= togo:
+            return False
+
+        axis_turns = self.axis_turns
+        x_turn = axis_turns[1][turn]
+        x_twist = self.twist_move[x_twist * FACE_TURNS_NUMBER + x_turn]
+        x_slice = self.slice_move[x_slice * FACE_TURNS_NUMBER + x_turn]
+        if self.twist_slice_pruning[x_twist * SLICES_NUMBER + x_slice] >= togo:
+            return False
+        x_flip = self.flip_move[x_flip * FACE_TURNS_NUMBER + x_turn]
+        if self.flip_slice_pruning[x_flip * SLICES_NUMBER + x_slice] >= togo:
+            return False
+
+        z_turn = axis_turns[2][turn]
+        z_twist = self.twist_move[z_twist * FACE_TURNS_NUMBER + z_turn]
+        z_slice = self.slice_move[z_slice * FACE_TURNS_NUMBER + z_turn]
+        if self.twist_slice_pruning[z_twist * SLICES_NUMBER + z_slice] >= togo:
+            return False
+        z_flip = self.flip_move[z_flip * FACE_TURNS_NUMBER + z_turn]
+        if self.flip_slice_pruning[z_flip * SLICES_NUMBER + z_slice] >= togo:
+            return False
+
+        corners = self.corner_permutation_move[corners * FACE_TURNS_NUMBER + turn]
+        if self.corner_permutation_pruning[corners] >= togo:
+            return False
+
+        self._turns.append(turn)
+        if togo == 1:
+            if self._is_solved():
+                return True
+        else:
+            for next_turn in _NEXT_TURNS[get_face(turn)]:
+                if self._search(twist, flip, slice_coordinate, x_twist, x_flip, x_slice, z_twist, z_flip, z_slice,
+                                corners, togo - 1, next_turn):
+                    return True
+        self._turns.pop()
+        return False
+
+    def _is_solved(self) -> bool:
+        """
+        Checks whether `self._turns` solves the cube. The heuristic is 0 for other cubes too, whose edges are permuted
+        inside their slices.
+        """
+        cubie_cube = self.cubie_cube
+        turn_cubie_cubes = get_face_turn_cubie_cubes()
+        for turn in self._turns:
+            cubie_cube = cubie_cube.multiply(turn_cubie_cubes[turn])
+        return cubie_cube.edge_permutation == list(range(len(cubie_cube.edge_permutation)))
+
+    def _count_nodes(self) -> bool:
+        """
+        Adds the nodes which were expanded since the last call to the shared counter.
+        :return: Whether the search should stop.
+        """
+        with self.nodes.get_lock():
+            self.nodes.value += self._unchecked_nodes
+            nodes = self.nodes.value
+        self._unchecked_nodes = 0
+        return (self.stop_event.is_set() or self.node_budget is not None and nodes >= self.node_budget or
+                self.deadline is not None and time.time() >= self.deadline)
+
+
+_worker_search: Optional[_Search] = None
+
+
+def _init_worker(directory: str, cubie_cube: CubieCube, coordinates: tuple[int, ...], stop_event: Event,
+                 nodes: Synchronized, node_budget: Optional[int], deadline: Optional[float]) -> None:
+    """
+    Prepares the search of a process (see: `_Search`). The tables are mapped from the files of the table store.
+    """
+    global _worker_search
+    tables = TableStore(directory, processes=1).load(OPTIMAL_TABLES)
+    _worker_search = _Search(tables, cubie_cube, coordinates, stop_event, nodes, node_budget, deadline)
+
+
+def _search_branch(branch: tuple[int, int]) -> tuple[Optional[list[int]], bool]:
+    """
+    Searches a branch (its first turn and the length of the solutions) by the search of the process.
+    """
+    return _worker_search.search_branch(*branch)
+
+
+class OptimalSolver(Solver):
+    def __init__(self, cube_3x3: Cube, processes: int = None, node_budget: int = None, time_budget: float = None,
+                 store: TableStore = None):
+        """
+        Finds a shortest solution of a 3x3 cube (in face turns, where a half turn is a single face turn) by an
+        iterative deepening A* search. The heuristic is the maximum of the distances of pairs of coordinates (see:
+        `Cube.coordinates`) of the cube, which are looked up in tables: the twist and the UD-slice, and the flip and
+        the UD-slice (of the cube seen from each axis, see: `AXIS_ROTATIONS`), and the corner permutation.
+        The first turns of each depth are split between the processes of a pool, and all the processes stop as soon as
+        one of them finds a solution.
+        Solving takes minutes or more for cubes which are more than about 13 turns away from solved, so the search can
+        be limited by a budget. When it runs out, the solution is not found, and `lower_bound` is the best bound found.
+        :param cube_3x3: The cube to solve. Its centers set the color of each face.
+        :param processes: The number of processes which search. Defaults to the number of CPUs.
+        :param node_budget: The maximal number of nodes to expand, or None for no limit.
+        :param time_budget: The maximal number of seconds to search, or None for no limit.
+        :param store: The store of the tables. Defaults to a store in the default directory (see: `TableStore`).
+        """
+        super().__init__(cube_3x3)
+        if cube_3x3.size != 3:
+            raise ValueError(f"Given Cube size is {cube_3x3.size} instead of 3.")
+        if processes is None:
+            processes = os.cpu_count() or 1
+        self.processes: int = processes
+        self.node_budget: Optional[int] = node_budget
+        self.time_budget: Optional[float] = time_budget
+        self.store: TableStore = TableStore() if store is None else store
+
+        self.faces_colors: dict[FaceID, Color] = dict()
+        for face_id in FaceID:
+            self.faces_colors[face_id] = self.cube.faces[face_id][1][1]
+
+        self.lower_bound: int = 0  # the number of turns which every solution has at least
+        self.nodes: int = 0  # the number of nodes which the search expanded
+
+    def get_coordinates(self) -> tuple[int, ...]:
+        """
+        Returns the coordinates which the search runs on: the twist, the flip and the slice coordinates of the cube
+        seen from each of `AXIS_ROTATIONS`, and the rank of the corner permutation.
+        """
+        coordinates = []
+        for rotation in AXIS_ROTATIONS:
+            rotated_cube = self.cube.get_symmetric(rotation)
+            faces_colors = {face_id: rotated_cube.faces[face_id][1][1] for face_id in FaceID}
+            cubie_cube = CubieCube.from_cube(rotated_cube, faces_colors)
+            coordinates += [get_twist(cubie_cube.corner_orientation), get_flip(cubie_cube.edge_orientation),
+                            get_slice(cubie_cube.edge_permutation)]
+        coordinates.append(get_permutation_rank(CubieCube.from_cube(self.cube, self.faces_colors).corner_permutation))
+        return tuple(coordinates)
+
+    def solve(self) -> tuple[bool, list[Move]]:
+        """
+        Searches for a shortest solution, within the budget.
+        :return: Whether a solution was found, and the moves of the solution.
+        :raise InvalidCubeError: If the cube can not be solved (see: `validate_cube`), before trying to solve it.
+        """
+        validate_cube(self.cube)
+        cubie_cube = CubieCube.from_cube(self.cube, self.faces_colors)
+        self.lower_bound = 0
+        self.nodes = 0
+        if cubie_cube == CubieCube():
+            return True, []
+
+        self.store.load(OPTIMAL_TABLES)  # builds the missing tables once, before the processes map them
+        stop_event = multiprocessing.Event()
+        nodes = multiprocessing.Value('q', 0)
+        deadline = None if self.time_budget is None else time.time() + self.time_budget
+        init_arguments = (self.store.directory, cubie_cube, self.get_coordinates(), stop_event, nodes,
+                          self.node_budget, deadline)
+
+        pool = None
+        if self.processes > 1:
+            pool = multiprocessing.Pool(self.processes, _init_worker, init_arguments)
+        else:
+            _init_worker(*init_arguments)
+
+        try:
+            for length in range(1, MAX_OPTIMAL_LENGTH + 1):
+                self.lower_bound = length
+                completed = True
+                branches = [(turn, length) for turn in _NEXT_TURNS[-1]]
+                results = map(_search_branch, branches) if pool is None else \
+                    pool.imap_unordered(_search_branch, branches)
+                for turns, branch_completed in results:
+                    if turns is not None:
+                        stop_event.set()
+                        moves = [move for turn in turns for move in get_face_turn_moves(turn)]
+                        self.cube.execute_moves(moves)
+                        return True, moves
+                    completed = completed and branch_completed
+                if not completed:
+                    return False, []
+        finally:
+            self.nodes = nodes.value
+            if pool is not None:
+                pool.terminate()
+        return False, []
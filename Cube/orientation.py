@@ -48,3 +48,7 @@ class Orientation(Enum):
                 is_forward = difference == 1
 
                 return [Orientation.X, Orientation.Y, Orientation.Z][i], is_forward
+
+
+ORIENTATIONS: list[Orientation] = list(Orientation)
+ORIENTATION_INDEXES: dict[Orientation, int] = {orientation: i for i, orientation in enumerate(ORIENTATIONS)}
@@ -0,0 +1,64 @@
+from operator import itemgetter
+from typing import Optional
+
+
+class Permutation:
+    def __init__(self, indexes: tuple[int, ...]):
+        """
+        A permutation of the stickers of a cube state. Applying the permutation to a state `s` results in the state
+        `[s[indexes[0]], s[indexes[1]], ...]`, meaning the i-th sticker after the permutation is the `indexes[i]`-th
+        sticker before it.
+        :param indexes: For each sticker index, the index the sticker is taken from.
+        """
+        self.indexes: tuple[int, ...] = tuple(indexes)
+        self._getter = itemgetter(*self.indexes) if len(self.indexes) > 1 else lambda state: tuple(state)
+        self._inverse: Optional[Permutation] = None  # computed on the first call of `inverse`
+
+    @staticmethod
+    def identity(stickers_number: int) -> 'Permutation':
+        return Permutation(tuple(range(stickers_number)))
+
+    def apply(self, state: bytearray) -> None:
+        """
+        Applies the permutation to `state` in place.
+        """
+        state[:] = self._getter(state)
+
+    def permute(self, sequence) -> tuple:
+        """
+        Returns the items of `sequence` in their order after the permutation.
+        """
+        return self._getter(sequence)
+
+    def then(self, other: 'Permutation') -> 'Permutation':
+        """
+        Returns the permutation which has the effect of applying `self` and then `other`.
+        """
+        return Permutation(other._getter(self.indexes))
+
+    def inverse(self) -> 'Permutation':
+        """
+        Returns the (cached) permutation which cancels the effect of `self`.
+        """
+        if self._inverse is None:
+            inverse_indexes = [0] * len(self.indexes)
+            for i, index in enumerate(self.indexes):
+                inverse_indexes[index] = i
+            self._inverse = Permutation(tuple(inverse_indexes))
+            self._inverse._inverse = self
+        return self._inverse
+
+    def is_identity(self) -> bool:
+        return all(i == index for i, index in enumerate(self.indexes))
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __eq__(self, other: 'Permutation') -> bool:
+        return self.indexes == other.indexes
+
+    def __hash__(self):
+        return hash(self.indexes)
+
+    def __repr__(self):
+        return f"Permutation({len(self.indexes)} stickers)"
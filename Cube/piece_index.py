@@ -0,0 +1,51 @@
+from operator import itemgetter
+
+
+class PieceIndex:
+    def __init__(self, size: int, state: bytearray):
+        """
+        An index of the locations of the pieces of a `size`x`size` cube. Each piece is tracked from the place (see:
+        `StickerTable.get_places`) it was in when the index was built, and the pieces are looked up by the set of their
+        color codes. Moving the pieces updates only the places of the moved pieces.
+        :param size: The size of the cube.
+        :param state: The cube state (see: `Cube.state`) to index.
+        """
+        from Cube.sticker_table import StickerTable
+
+        self.size: int = size
+        self.places, self.sticker_places = StickerTable.get(size).get_places()
+
+        self.colors_pieces: dict[frozenset[int], list[int]] = dict()  # the pieces are numbered by their first place
+        for piece, place in enumerate(self.places):
+            self.colors_pieces.setdefault(frozenset([state[index] for index in place]), []).append(piece)
+
+        self.place_pieces: list[int] = list(range(len(self.places)))  # the piece at each place
+        self.piece_places: list[int] = list(range(len(self.places)))  # the place of each piece
+
+    def move_places(self, places: tuple[int, ...], new_places: tuple[int, ...]) -> None:
+        """
+        Updates the index after the pieces at `places` were moved to the places at the same indexes of `new_places`.
+        """
+        if not places:
+            return
+
+        moved_pieces = itemgetter(*places)(self.place_pieces) if len(places) > 1 else (self.place_pieces[places[0]],)
+        place_pieces, piece_places = self.place_pieces, self.piece_places
+        for new_place, piece in zip(new_places, moved_pieces):
+            place_pieces[new_place] = piece
+            piece_places[piece] = new_place
+
+    def find(self, color_codes: list[int]) -> list[tuple[int, ...]]:
+        """
+        Returns the places (see: `StickerTable.get_places`) of the pieces with the given color codes.
+        """
+        return [self.places[self.piece_places[piece]] for piece in self.colors_pieces.get(frozenset(color_codes), ())]
+
+    def copy(self) -> 'PieceIndex':
+        piece_index = PieceIndex.__new__(PieceIndex)
+        piece_index.size = self.size
+        piece_index.places, piece_index.sticker_places = self.places, self.sticker_places
+        piece_index.colors_pieces = self.colors_pieces  # the colors of the pieces never change
+        piece_index.place_pieces = self.place_pieces.copy()
+        piece_index.piece_places = self.piece_places.copy()
+        return piece_index
@@ -0,0 +1,369 @@
+from functools import lru_cache
+from typing import Optional, Type, Union
+
+from Cube.color import COLOR_CODES
+from Cube.cube import Cube
+from Cube.cubie_cube import CubieCube, get_permutation_parity
+from Cube.face_id import FaceID
+from Cube.move import BlockMove, Move
+from Cube.move_table import MoveTable
+from Cube.orientation import Orientation
+from Cube.permutation import Permutation
+from Cube.solver import Solver
+from Cube.solver_3x3 import Solver3x3
+from Cube.symmetry import FACE_AXES, ROTATIONS_NUMBER, SYMMETRIES, Vector, get_piece_sticker_points, \
+    get_sticker_coordinates
+from Cube.validator import PERMUTATION_PARITY, PIECES, InvalidCubeError, get_skeleton, validate_cube
+
+# The orientation of the moves which turn the layers of each axis (x, y and z, see: `FACE_AXES`)
+AXIS_ORIENTATIONS: tuple[Orientation, ...] = (Orientation.Y, Orientation.X, Orientation.Z)
+
+# A quarter turn, a half turn or a reversed quarter turn of a layer: its axis, the coordinate of the centers of its
+# pieces along the axis (doubled, like `get_sticker_coordinates`) and the number of forward quarter turns.
+LayerTurn = tuple[int, int, int]
+
+_NORMAL_FACE_IDS: dict[Vector, FaceID] = {axes[0]: face_id for face_id, axes in FACE_AXES.items()}
+
+
+def get_layer_turn_moves(turn: LayerTurn, size: int) -> list[Move]:
+    """
+    Returns the moves of a layer turn of a `size`x`size` cube, with a half turn as two forward moves.
+    """
+    axis, coordinate, quarter_turns = turn
+    orientation = AXIS_ORIENTATIONS[axis]
+    if orientation is Orientation.X:  # the X orientation moves are numbered from the U face down
+        index = (size - 1 - coordinate) // 2
+    else:
+        index = (size - 1 + coordinate) // 2
+    if quarter_turns == 3:
+        return [Move(orientation, index, False)]
+    return [Move(orientation, index, True)] * quarter_turns
+
+
+def _reverse_turns(turns: list[LayerTurn]) -> list[LayerTurn]:
+    return [(axis, coordinate, 4 - quarter_turns) for axis, coordinate, quarter_turns in reversed(turns)]
+
+
+class _OrbitTable:
+    def __init__(self, size: int, representative: Vector):
+        """
+        The 3-cycles of the pieces of an orbit (the pieces which moves can bring to each other's positions), by
+        commutators `A B A' B'` whose moves `A` and `B` have a single piece in common, so that every other piece is
+        restored. Setup moves bring any 3 positions of the orbit to the positions which such a commutator cycles, and
+        are found by a breadth-first search over the triples of positions.
+        All the orbits of wings, and all the orbits of centers of each shape, cycle alike, so the table is built on
+        the smallest cube which has the orbit (see: `_Orbit`).
+        :param size: The size of the cube.
+        :param representative: The center of a piece of the orbit.
+        """
+        self.size: int = size
+        self.positions: list[Vector] = sorted({rotation.apply_to_vector(representative)
+                                               for rotation in SYMMETRIES[:ROTATIONS_NUMBER]})
+        positions_number = len(self.positions)
+
+        sticker_indexes = {point: index for index, point in enumerate(get_sticker_coordinates(size))}
+        stickers = [[sticker_indexes[point] for point in get_piece_sticker_points(position, size)]
+                    for position in self.positions]
+        sticker_positions = {sticker: position for position, indexes in enumerate(stickers) for sticker in indexes}
+
+        # every turn of the layers which have pieces of the orbit, and the position each position is moved to
+        self.turns: list[LayerTurn] = [(axis, coordinate, quarter_turns) for axis in range(3)
+                                       for coordinate in sorted({position[axis] for position in self.positions})
+                                       for quarter_turns in (1, 2, 3)]
+        move_table = MoveTable.get(size)
+        permutations = {turn: move_table.compile(get_layer_turn_moves(turn, size)) for turn in self.turns}
+        self.turn_positions: list[tuple[int, ...]] = []
+        for turn in self.turns:
+            inverse_indexes = permutations[turn].inverse().indexes  # the index each sticker is moved to
+            self.turn_positions.append(tuple(sticker_positions[inverse_indexes[indexes[0]]] for indexes in stickers))
+
+        # the commutators which cycle the first position
+        self.commutators: list[list[LayerTurn]] = []
+        cycles: dict[tuple[int, int, int], int] = dict()
+        first_stickers = stickers[0]
+        face_turns = [turn for turn in self.turns if abs(turn[1]) == size - 1 and turn[2] != 2]
+        for a in self.turns:
+            if abs(a[1]) == size - 1 or permutations[a].indexes[first_stickers[0]] == first_stickers[0]:
+                continue  # the first move is an inner layer turn which moves the first position
+            for setup in face_turns:
+                for b in self.turns:
+                    b_turns = [setup, b] + _reverse_turns([setup])
+                    commutator = [a] + b_turns + _reverse_turns([a]) + _reverse_turns(b_turns)
+                    cycle = self._get_cycle(commutator, permutations, stickers)
+                    if cycle is not None and cycle not in cycles:
+                        cycles[cycle] = len(self.commutators)
+                        self.commutators.append(commutator)
+                        cycles[cycle[::-1]] = len(self.commutators)  # the inverse commutator reverses the cycle
+                        self.commutators.append(_reverse_turns(commutator))
+
+        # for each triple of positions (as `(a * number + b) * number + c`): the index of a commutator which cycles it
+        # (negated, minus 1), or the turn which brings it closer to one which a commutator cycles
+        self.steps: list[Optional[int]] = [None] * positions_number ** 3
+        frontier = []
+        for (a, b, c), commutator_index in cycles.items():
+            for triple in ((a, b, c), (b, c, a), (c, a, b)):
+                index = (triple[0] * positions_number + triple[1]) * positions_number + triple[2]
+                self.steps[index] = -1 - commutator_index
+                frontier.append(index)
+        inverse_turn_positions = [self.turn_positions[self.turns.index(_reverse_turns([turn])[0])]
+                                  for turn in self.turns]
+        while frontier:
+            next_frontier = []
+            for index in frontier:
+                ab, c = divmod(index, positions_number)
+                a, b = divmod(ab, positions_number)
+                for turn_index, positions in enumerate(inverse_turn_positions):
+                    previous_index = (positions[a] * positions_number + positions[b]) * positions_number + positions[c]
+                    if self.steps[previous_index] is None:
+                        self.steps[previous_index] = turn_index
+                        next_frontier.append(previous_index)
+            frontier = next_frontier
+
+    def _get_cycle(self, turns: list[LayerTurn], permutations: dict[LayerTurn, Permutation],
+                   stickers: list[list[int]]) -> Optional[tuple[int, int, int]]:
+        """
+        Returns the positions `(a, b, c)` if the turns move the piece at `a` to `b`, the piece at `b` to `c` and the
+        piece at `c` to `a`, and move nothing else; otherwise returns None.
+        """
+        permutation = Permutation.identity(len(permutations[turns[0]]))
+        for turn in turns:
+            permutation = permutation.then(permutations[turn])
+        moved = [index for index, source in enumerate(permutation.indexes) if index != source]
+        if len(moved) != 3 * len(stickers[0]):
+            return None
+
+        cycled = [position for position, indexes in enumerate(stickers) if indexes[0] in moved]
+        if len(cycled) != 3 or cycled[0] != 0:
+            return None
+        sources = {position: next(source for source, indexes in enumerate(stickers)
+                                  if indexes[0] == permutation.indexes[stickers[position][0]])
+                   for position in cycled}
+        a = sources[0]
+        c = sources[a]
+        if sources[c] != 0:
+            return None
+        return a, 0, c
+
+    def get_cycle_turns(self, a: int, b: int, c: int) -> list[LayerTurn]:
+        """
+        Returns the turns which move the piece at position `a` to `b`, the piece at `b` to `c` and the piece at `c`
+        to `a` (positions are indexes in `positions`), and restore every other piece of the cube.
+        """
+        positions_number = len(self.positions)
+        setup = []
+        step = self.steps[(a * positions_number + b) * positions_number + c]
+        while step >= 0:
+            setup.append(self.turns[step])
+            positions = self.turn_positions[step]
+            a, b, c = positions[a], positions[b], positions[c]
+            step = self.steps[(a * positions_number + b) * positions_number + c]
+        return setup + self.commutators[-1 - step] + _reverse_turns(setup)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get(size: int, representative: Vector) -> '_OrbitTable':
+        """
+        Returns the (cached) table of the orbit of `representative`, which is given by its smallest position.
+        """
+        return _OrbitTable(size, representative)
+
+
+class _Orbit:
+    def __init__(self, size: int, representative: Vector):
+        """
+        The positions of an orbit of wings or centers of a `size`x`size` cube (see: `_OrbitTable`).
+        :param size: The size of the cube, which is at least 4.
+        :param representative: The center of a piece of the orbit, on the U face (a center) or on its edge with the F
+            face (a wing), which is not a corner, a middle edge or a middle center.
+        """
+        self.size: int = size
+        x, _, z = representative
+        if abs(z) == size - 1:
+            table_size, magnitudes = 4, {abs(x): 1}  # wings
+        elif abs(x) == abs(z):
+            table_size, magnitudes = 4, {abs(x): 1}  # the centers on the diagonals
+        elif x == 0 or z == 0:
+            table_size, magnitudes = 5, {0: 0, abs(x) + abs(z): 2}  # the centers on the middle lines
+        else:
+            table_size, magnitudes = 6, {min(abs(x), abs(z)): 1, max(abs(x), abs(z)): 3}  # the other centers
+        magnitudes[size - 1] = table_size - 1
+
+        # the coordinates of the orbit are mapped to those of the table's cube, keeping their order and their signs
+        self._magnitudes: dict[int, int] = {table_magnitude: magnitude
+                                            for magnitude, table_magnitude in magnitudes.items()}
+        table_representative = min(tuple(magnitudes[abs(coordinate)] * (1 if coordinate > 0 else -1) for coordinate in
+                                         rotation.apply_to_vector(representative))
+                                   for rotation in SYMMETRIES[:ROTATIONS_NUMBER])
+        self.table: _OrbitTable = _OrbitTable.get(table_size, table_representative)
+        self.positions: list[Vector] = [self._from_table(position) for position in self.table.positions]
+
+    def _from_table(self, point: Vector) -> Vector:
+        return tuple(self._magnitudes[abs(coordinate)] * (1 if coordinate > 0 else -1) for coordinate in point)
+
+    def get_cycle_moves(self, a: int, b: int, c: int) -> list[Move]:
+        """
+        Returns the moves which 3-cycle the pieces at 3 positions of the orbit (see: `_OrbitTable.get_cycle_turns`).
+        """
+        moves = []
+        for axis, coordinate, quarter_turns in self.table.get_cycle_turns(a, b, c):
+            coordinate = self._magnitudes[abs(coordinate)] * (1 if coordinate > 0 else -1)
+            moves += get_layer_turn_moves((axis, coordinate, quarter_turns), self.size)
+        return moves
+
+
+class ReductionSolver(Solver):
+    def __init__(self, cube: Cube, solver_3x3_type: Type[Solver] = Solver3x3):
+        """
+        Solves a cube of any size by reducing it to a 3x3 cube. The 3x3 skeleton of the cube (its corners, and its
+        middle edges and centers if its size is odd) is solved first by a 3x3 solver. Then each orbit of centers and
+        each orbit of wings (the edge pieces which are not middle edges) is solved by 3-cycles, which are commutators
+        that keep the rest of the cube, so the skeleton stays solved. An odd permutation of an orbit of wings (the
+        parity which 3x3 solvers can not fix) is fixed by a single quarter turn of an inner layer first.
+        The number of moves and the time both grow like the number of pieces, `size ** 2`.
+        :param cube: The cube to solve.
+        :param solver_3x3_type: The solver of the 3x3 skeleton.
+        """
+        super().__init__(cube)
+        self.solver_3x3_type: Type[Solver] = solver_3x3_type
+        self.face_codes: dict[FaceID, int] = dict()
+
+    def solve(self) -> tuple[bool, list[Move]]:
+        """
+        Solves the cube.
+        :return: Whether the cube was solved, and the moves which solve it.
+        :raise InvalidCubeError: If the cube can not be solved (see: `validate_cube`), before trying to solve it.
+        """
+        validate_cube(self.cube)
+        size = self.cube.size
+        if size < 2:
+            return True, []
+
+        is_solved, moves = self.solve_skeleton()
+        if not is_solved or size < 4:
+            return is_solved, Move.simplify(moves)
+
+        _, face_colors = get_skeleton(self.cube)
+        self.face_codes = {face_id: COLOR_CODES[color] for face_id, color in face_colors.items()}
+        wing_orbits = [_Orbit(size, (x, size - 1, size - 1)) for x in range(1 + size % 2, size - 2, 2)]
+        moves += self.fix_wing_parities(wing_orbits)
+        for orbit in self.get_center_orbits():
+            moves += self.solve_orbit(orbit)
+        for orbit in wing_orbits:
+            moves += self.solve_orbit(orbit)
+
+        state = self.cube.state
+        face_size = size * size
+        is_solved = all(state.count(state[start], start, start + face_size) == face_size
+                        for start in range(0, len(state), face_size))
+        return is_solved, Move.simplify(moves)
+
+    def solve_skeleton(self) -> tuple[bool, list[Union[Move, BlockMove]]]:
+        """
+        Solves the skeleton of the cube (see: `get_skeleton`) by the 3x3 solver. The moves of its middle layers are
+        done by turning all the inner layers together.
+        """
+        size = self.cube.size
+        moves: list[Union[Move, BlockMove]] = []
+        skeleton, face_colors = get_skeleton(self.cube)
+        if size % 2 == 0 and CubieCube.from_cube(skeleton, face_colors).get_corner_parity():
+            # the made up edges of an even skeleton must have the parity of its corners
+            moves.append(Move(Orientation.X, 0, True))
+            self.cube.move(moves[0])
+            skeleton, face_colors = get_skeleton(self.cube)
+
+        is_solved, skeleton_moves = self.solver_3x3_type(skeleton).solve()
+        cube_moves: list[Union[Move, BlockMove]] = []
+        for move in skeleton_moves:
+            if move.index != 1:
+                cube_moves.append(Move(move.orientation, 0 if move.index == 0 else size - 1, move.is_forward))
+            elif size == 3:
+                cube_moves.append(move)
+            elif size > 3:  # a 2x2 cube has no inner layers
+                cube_moves.append(BlockMove(move.orientation, 1, size - 2, move.is_forward))
+        self.cube.execute_moves(cube_moves)
+        return is_solved, moves + cube_moves
+
+    def get_center_orbits(self) -> list[_Orbit]:
+        size = self.cube.size
+        orbits = []
+        covered = set()
+        for x in range(3 - size, size - 2, 2):
+            for z in range(3 - size, size - 2, 2):
+                if (x, z) != (0, 0) and (x, size - 1, z) not in covered:
+                    orbits.append(_Orbit(size, (x, size - 1, z)))
+                    covered.update(orbits[-1].positions)
+        return orbits
+
+    def fix_wing_parities(self, orbits: list[_Orbit]) -> list[Move]:
+        """
+        Makes the permutation of each orbit of wings even, so 3-cycles can solve it, by a quarter turn of an inner
+        layer of the orbit, which moves its wings by a 4-cycle (and moves centers, which are solved later).
+        :raise InvalidCubeError: If an orbit does not have the wings of the solved orbit.
+        """
+        moves = []
+        for orbit in orbits:
+            pieces, targets = self._get_pieces(orbit)
+            if sorted(pieces) != sorted(targets):
+                raise InvalidCubeError(PIECES, f"The wings of the orbit of {orbit.positions[0]} are not its pieces.")
+            if get_permutation_parity([targets.index(piece) for piece in pieces]):
+                turn_moves = get_layer_turn_moves((0, min(abs(coordinate) for coordinate in orbit.positions[0]), 1),
+                                                  self.cube.size)
+                self.cube.execute_moves(turn_moves)
+                moves += turn_moves
+        return moves
+
+    def solve_orbit(self, orbit: _Orbit) -> list[Move]:
+        """
+        Solves the pieces of an orbit by 3-cycles (centers of the same color are interchangeable). Each 3-cycle brings
+        the right piece to an unsolved position, and moves its piece to the position it belongs at, if it can.
+        :raise InvalidCubeError: If the orbit does not have the pieces of the solved orbit, or they are in an odd
+            permutation which no 3-cycles solve.
+        """
+        pieces, targets = self._get_pieces(orbit)
+        moves = []
+        while True:
+            unsolved = [position for position, piece in enumerate(pieces) if piece != targets[position]]
+            if not unsolved:
+                break
+            target = unsolved[0]
+            source = next((position for position in unsolved if pieces[position] == targets[target]), None)
+            if source is None:
+                raise InvalidCubeError(PIECES, f"The orbit of {orbit.positions[0]} has no piece for the position "
+                                               f"{orbit.positions[target]}.")
+            others = [position for position in unsolved if position not in (source, target)]
+            # prefer the position of the piece at the target, and otherwise a solved position of a piece like it
+            third = next((position for position in others if targets[position] == pieces[target]), None)
+            if third is None:
+                third = others[0] if others else next((position for position, piece in enumerate(pieces)
+                                                       if piece == targets[position] == pieces[target]), None)
+            if third is None:  # two swapped pieces, which no 3-cycle solves
+                raise InvalidCubeError(PERMUTATION_PARITY, f"The permutation of the orbit of {orbit.positions[0]} "
+                                                           f"is odd.")
+
+            moves += orbit.get_cycle_moves(source, target, third)
+            pieces[source], pieces[target], pieces[third] = pieces[third], pieces[source], pieces[target]
+        self.cube.execute_moves(moves)
+        return moves
+
+    def _get_pieces(self, orbit: _Orbit) -> tuple[list[tuple[int, ...]], list[tuple[int, ...]]]:
+        """
+        Returns the colors (as sticker codes) of the piece at each position of an orbit, and the colors of the piece
+        which belongs at each position.
+        """
+        size = self.cube.size
+        sticker_indexes = _get_sticker_indexes(size)
+        state = self.cube.state
+        pieces = []
+        targets = []
+        for position in orbit.positions:
+            points = get_piece_sticker_points(position, size)
+            pieces.append(tuple(state[sticker_indexes[point]] for point in points))
+            # a sticker is on the face whose normal points from the center of the piece to the sticker
+            targets.append(tuple(self.face_codes[_NORMAL_FACE_IDS[tuple(a - b for a, b in zip(point, position))]]
+                                 for point in points))
+        return pieces, targets
+
+
+@lru_cache(maxsize=None)
+def _get_sticker_indexes(size: int) -> dict[Vector, int]:
+    return {point: index for index, point in enumerate(get_sticker_coordinates(size))}
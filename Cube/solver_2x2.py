@@ -0,0 +1,209 @@
+from array import array
+from math import factorial
+from typing import Optional
+
+from Cube.coordinates import FACE_TURNS, get_face_turn_cubie_cubes, get_face_turn_moves, get_permutation_rank, \
+    set_permutation_rank
+from Cube.cube import Cube
+from Cube.cubie_cube import CubieCube
+from Cube.move import Move
+from Cube.orientation import Orientation
+from Cube.solver import Solver
+from Cube.table_store import Table, TableSpec, TableStore
+from Cube.validator import get_skeleton, validate_cube
+
+# A 2x2 cube is solved with its DBL corner kept in place, by turns of the U, R and F faces (see: `FACE_TURNS`). The
+# other 7 corners are numbered in the order of `CORNERS`.
+FIXED_CORNER = 6
+MOVING_CORNERS: list[int] = [corner for corner in range(8) if corner != FIXED_CORNER]
+TURNS_2X2: list[int] = [turn for turn, (orientation, index, _) in enumerate(FACE_TURNS)
+                        if index == (0 if orientation is Orientation.X else 2)]
+TURNS_2X2_NUMBER = len(TURNS_2X2)
+
+PERMUTATIONS_2X2_NUMBER = factorial(7)
+TWISTS_2X2_NUMBER = 3 ** 6  # the orientation of the last moving corner is set by the others
+STATES_2X2_NUMBER = PERMUTATIONS_2X2_NUMBER * TWISTS_2X2_NUMBER  # 3,674,160
+
+
+def get_2x2_permutation(corner_permutation: list[int]) -> int:
+    """
+    Returns the rank of the permutation of the moving corners (see: `MOVING_CORNERS`) of a corner permutation which
+    keeps the fixed corner.
+    """
+    return get_permutation_rank([MOVING_CORNERS.index(corner_permutation[corner]) for corner in MOVING_CORNERS])
+
+
+def set_2x2_permutation(permutation: int) -> list[int]:
+    corner_permutation = [FIXED_CORNER] * 8
+    for corner, moving_index in zip(MOVING_CORNERS, set_permutation_rank(permutation, len(MOVING_CORNERS))):
+        corner_permutation[corner] = MOVING_CORNERS[moving_index]
+    return corner_permutation
+
+
+def get_2x2_twist(corner_orientation: list[int]) -> int:
+    twist = 0
+    for corner in MOVING_CORNERS[:-1]:
+        twist = twist * 3 + corner_orientation[corner]
+    return twist
+
+
+def set_2x2_twist(twist: int) -> list[int]:
+    corner_orientation = [0] * 8
+    for corner in reversed(MOVING_CORNERS[:-1]):
+        twist, corner_orientation[corner] = divmod(twist, 3)
+    corner_orientation[MOVING_CORNERS[-1]] = -sum(corner_orientation) % 3
+    return corner_orientation
+
+
+def build_2x2_permutation_move_table() -> array:
+    """
+    Returns the move table of the 2x2 permutation coordinate: the permutation after each turn of `TURNS_2X2` is at
+    `table[permutation * TURNS_2X2_NUMBER + turn index]`.
+    """
+    cubie_cubes = [get_face_turn_cubie_cubes()[turn] for turn in TURNS_2X2]
+    table = array('H')
+    for permutation in range(PERMUTATIONS_2X2_NUMBER):
+        corner_permutation = set_2x2_permutation(permutation)
+        for cubie_cube in cubie_cubes:
+            table.append(get_2x2_permutation([corner_permutation[i] for i in cubie_cube.corner_permutation]))
+    return table
+
+
+def build_2x2_twist_move_table() -> array:
+    """
+    Returns the move table of the 2x2 twist coordinate (see: `build_2x2_permutation_move_table`).
+    """
+    cubie_cubes = [get_face_turn_cubie_cubes()[turn] for turn in TURNS_2X2]
+    table = array('H')
+    for twist in range(TWISTS_2X2_NUMBER):
+        corner_orientation = set_2x2_twist(twist)
+        for cubie_cube in cubie_cubes:
+            table.append(get_2x2_twist([(corner_orientation[i] + orientation) % 3 for i, orientation in
+                                        zip(cubie_cube.corner_permutation, cubie_cube.corner_orientation)]))
+    return table
+
+
+def build_2x2_distance_table(permutation_move_table: Table, twist_move_table: Table) -> bytearray:
+    """
+    Finds the distance of every 2x2 state from the solved state by a breadth-first search.
+    :param permutation_move_table: The move table of the 2x2 permutation coordinate.
+    :param twist_move_table: The move table of the 2x2 twist coordinate.
+    :return: The distances modulo 3, in 2 bits per state: the distance of the state `permutation * TWISTS_2X2_NUMBER +
+        twist` is at the bits `2 * (state % 4)` and `2 * (state % 4) + 1` of the byte `state // 4`. A neighbour of a
+        state is closer to the solved state exactly if its distance is 1 less modulo 3, which is all that solving needs.
+    """
+    unreached = 0xff
+    distances = bytearray([unreached]) * STATES_2X2_NUMBER
+    distances[0] = 0
+    frontier = [0]
+    depth = 0
+    permutation_turns = [[permutation_move_table[permutation * TURNS_2X2_NUMBER + turn_index] * TWISTS_2X2_NUMBER
+                          for turn_index in range(TURNS_2X2_NUMBER)] for permutation in range(PERMUTATIONS_2X2_NUMBER)]
+    twist_turns = [twist_move_table[twist * TURNS_2X2_NUMBER:(twist + 1) * TURNS_2X2_NUMBER]
+                   for twist in range(TWISTS_2X2_NUMBER)]
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for state in frontier:
+            permutation, twist = divmod(state, TWISTS_2X2_NUMBER)
+            for next_state in map(int.__add__, permutation_turns[permutation], twist_turns[twist]):
+                if distances[next_state] == unreached:
+                    distances[next_state] = depth
+                    next_frontier.append(next_state)
+        frontier = next_frontier
+
+    # 4 distances modulo 3 are packed into a byte, by packing the bytes of every 4th state together
+    distances = distances.translate(bytes(depth % 3 for depth in range(256)))
+    packed = 0
+    for offset in range(4):
+        packed |= int.from_bytes(distances[offset::4], "little") << (2 * offset)
+    return bytearray(packed.to_bytes(STATES_2X2_NUMBER // 4, "little"))
+
+
+PERMUTATION_2X2_MOVE_TABLE = TableSpec("permutation_2x2_move", 1, build_2x2_permutation_move_table)
+TWIST_2X2_MOVE_TABLE = TableSpec("twist_2x2_move", 1, build_2x2_twist_move_table)
+DISTANCE_2X2_TABLE = TableSpec("distance_2x2", 1, build_2x2_distance_table,
+                               (PERMUTATION_2X2_MOVE_TABLE.name, TWIST_2X2_MOVE_TABLE.name))
+SOLVER_2X2_TABLES: list[TableSpec] = [PERMUTATION_2X2_MOVE_TABLE, TWIST_2X2_MOVE_TABLE, DISTANCE_2X2_TABLE]
+
+
+class Solver2x2Tables:
+    """
+    The move tables and the distance table of the 2x2 solver (see: `Solver2x2`). Building them takes about 10 seconds,
+    so they are kept by a `TableStore`, and are built only once.
+    """
+    _tables: Optional['Solver2x2Tables'] = None
+
+    def __init__(self, store: TableStore = None):
+        """
+        :param store: The store of the tables. Defaults to a store in the default directory (see: `TableStore`).
+        """
+        tables = (TableStore() if store is None else store).load(SOLVER_2X2_TABLES)
+        self.permutation_move: Table = tables[PERMUTATION_2X2_MOVE_TABLE.name]
+        self.twist_move: Table = tables[TWIST_2X2_MOVE_TABLE.name]
+        self.distance: Table = tables[DISTANCE_2X2_TABLE.name]
+
+    def get_distance_modulo_3(self, state: int) -> int:
+        return (self.distance[state >> 2] >> ((state & 3) * 2)) & 3
+
+    @staticmethod
+    def get() -> 'Solver2x2Tables':
+        """
+        Returns the (cached) tables.
+        """
+        if Solver2x2Tables._tables is None:
+            Solver2x2Tables._tables = Solver2x2Tables()
+        return Solver2x2Tables._tables
+
+
+class Solver2x2(Solver):
+    def __init__(self, cube_2x2: Cube):
+        """
+        Solves a 2x2 cube optimally (by the fewest face turns, where a half turn is a single face turn) from a table of
+        the distances of all its 3,674,160 states (see: `build_2x2_distance_table`). Each turn of a solution is a turn
+        to a neighbouring state which is closer to the solved state, so solving takes no search.
+        :param cube_2x2: The cube to solve. Its DBL corner sets the color of each face.
+        """
+        super().__init__(cube_2x2)
+        if cube_2x2.size != 2:
+            raise ValueError(f"Given Cube size is {cube_2x2.size} instead of 2.")
+
+    def get_state(self) -> int:
+        """
+        Returns the state of the cube: `permutation * TWISTS_2X2_NUMBER + twist` (see: `get_2x2_permutation` and
+        `get_2x2_twist`).
+        """
+        skeleton, face_colors = get_skeleton(self.cube, FIXED_CORNER)
+        cubie_cube = CubieCube.from_cube(skeleton, face_colors)
+        return (get_2x2_permutation(cubie_cube.corner_permutation) * TWISTS_2X2_NUMBER +
+                get_2x2_twist(cubie_cube.corner_orientation))
+
+    def solve(self) -> tuple[bool, list[Move]]:
+        """
+        Solves the cube by the fewest face turns.
+        :return: Whether the cube was solved (always True), and the moves which solve it.
+        :raise InvalidCubeError: If the cube can not be solved (see: `validate_cube`), before trying to solve it.
+        """
+        validate_cube(self.cube)
+        tables = Solver2x2Tables.get()
+        state = self.get_state()
+
+        turns = []
+        distance = tables.get_distance_modulo_3(state)
+        while state:
+            permutation, twist = divmod(state, TWISTS_2X2_NUMBER)
+            closer_distance = (distance - 1) % 3
+            for turn_index in range(TURNS_2X2_NUMBER):
+                next_state = (tables.permutation_move[permutation * TURNS_2X2_NUMBER + turn_index] * TWISTS_2X2_NUMBER
+                              + tables.twist_move[twist * TURNS_2X2_NUMBER + turn_index])
+                if tables.get_distance_modulo_3(next_state) == closer_distance:
+                    break
+            turns.append(TURNS_2X2[turn_index])
+            state = next_state
+            distance = closer_distance
+
+        # the R and F faces are the slices at index 2 of a 3x3 cube, and at index 1 of a 2x2 cube
+        moves = [Move(move.orientation, min(move.index, 1), move.is_forward)
+                 for turn in turns for move in get_face_turn_moves(turn)]
+        self.cube.execute_moves(moves)
+        return True, moves
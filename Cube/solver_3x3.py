@@ -4,6 +4,7 @@ from Cube.face_id import FaceID, RING_FACE_IDS
 from Cube.location import Location
 from Cube.move import Move
 from Cube.solver import Solver
+from Cube.validator import validate_cube
 
 
 class Solver3x3(Solver):
@@ -11,6 +12,7 @@ class Solver3x3(Solver):
         super().__init__(cube_3x3)
         if cube_3x3.size != 3:
             raise Exception(f"Given Cube size is {cube_3x3.size} instead of 3.")
+        self.cube.enable_piece_index()
 
         self.faces_colors: dict[FaceID: Color] = dict()
         for face_id in FaceID:
@@ -75,35 +77,23 @@ class Solver3x3(Solver):
         :return: List of locations [face id, row, col] of the specified sticker. The i-th element of the returned value
         is the location of the i-th color in `colors`. If the sticker wasn't found, raises a `ValueError`.
         """
-        colors_set = set(colors)
-
-        for face_id in FaceID:
-            face = self.cube.faces[face_id]
-
-            for i in range(self.cube.size):
-                for j in range(self.cube.size):
-                    location = Location(face_id, i, j)
-                    other_locations: list[Location] = (self.cube.get_other_sticker_locations(location))
-
-                    found_colors: set[Color] = {self.cube.get_location_color(loc) for loc in other_locations}
-                    found_colors.add(face[i][j])  # add current color
-
-                    if found_colors == colors_set:  # sticker found
-                        locations = other_locations + [location]  # add current location
-
-                        # sort by the order of colors in 'colors'
-                        def sort_by(loc):
-                            return colors.index(self.cube.get_location_color(loc))
-
-                        return sorted(locations, key=sort_by)
-
-        raise ValueError("The specified sticker was not found.")
+        pieces_locations = self.cube.find_piece_locations(colors)
+        if not pieces_locations:
+            raise ValueError("The specified sticker was not found.")
+        return pieces_locations[0]
 
     def _add_and_apply(self, lst: list, move: Move):
         lst.append(move)
         self.cube.move(move)
 
     def solve(self) -> tuple[bool, list[Move]]:
+        """
+        Solves the cube layer by layer.
+        :return: Whether the cube was solved, and the moves which solve it.
+        :raise InvalidCubeError: If the cube can not be solved (see: `validate_cube`), before trying to solve it.
+        """
+        validate_cube(self.cube)
+
         cross_moves = self.solve_cross()
         u_color_moves = self.solve_u_color()
         second_strip_moves = self.solve_second_x_strip()
@@ -112,7 +102,7 @@ class Solver3x3(Solver):
         moves = cross_moves + u_color_moves + second_strip_moves + d_cross_moves
 
         if not can_solve_d_cross:
-            return False, moves
+            return False, Move.simplify(moves)
 
         d_cross_positions = self.solve_d_cross_positions()
         moves += d_cross_positions
@@ -120,11 +110,11 @@ class Solver3x3(Solver):
         can_solve_d_corner_positions, d_corner_position_moves = self.solve_d_corner_positions()
         moves += d_corner_position_moves
         if not can_solve_d_corner_positions:
-            return False, moves
+            return False, Move.simplify(moves)
 
         can_solve_d_corner_orientations, d_corners_orientation_moves = self.solve_d_corner_orientations()
         moves += d_corners_orientation_moves
-        return can_solve_d_corner_orientations, moves
+        return can_solve_d_corner_orientations, Move.simplify(moves)
 
     def _from_third_ring_corner_to_u(self, up_location: Location, move_down_location: Location) -> list[Move]:
         """
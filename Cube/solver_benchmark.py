@@ -0,0 +1,37 @@
+import sys
+import time
+
+from Cube.cube import Cube
+from Cube.reduction_solver import ReductionSolver
+
+
+def measure_solver(size: int, shuffles_number: int = 3) -> tuple[float, float]:
+    """
+    Measures `ReductionSolver` on shuffled `size`x`size` cubes. The tables of its 3-cycles are built before timing.
+    :param size: The size of the cubes.
+    :param shuffles_number: The number of shuffled cubes to solve.
+    :return: The average time of a solve in seconds, and the average number of moves of a solution.
+    """
+    ReductionSolver(Cube(size)).solve()
+
+    total_time = 0
+    total_moves = 0
+    for seed in range(shuffles_number):
+        cube = Cube(size)
+        cube.execute_moves(cube.iter_shuffle_moves(30 * size * size, seed=seed))
+        start = time.perf_counter()
+        _, moves = ReductionSolver(cube).solve()
+        total_time += time.perf_counter() - start
+        total_moves += len(moves)
+    return total_time / shuffles_number, total_moves / shuffles_number
+
+
+def main(sizes: list[int]):
+    print(f"{'size':>6} {'solve (s)':>10} {'moves':>8} {'moves/n^2':>10}")
+    for size in sizes:
+        solve_time, moves_number = measure_solver(size)
+        print(f"{size:>6} {solve_time:>10.3f} {moves_number:>8.0f} {moves_number / (size * size):>10.1f}")
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or list(range(2, 21)))
@@ -0,0 +1,131 @@
+from Cube.face_id import FACE_IDS
+from Cube.location import Location
+from Cube.move import Move
+from Cube.orientation import Orientation, ORIENTATIONS
+
+
+class StickerTable:
+    """
+    Precomputed geometric relations between the stickers of a `size`x`size` cube: the other stickers of each piece,
+    and where each sticker which moves to another face by a move goes. The traces of a move are computed on its first
+    use.
+    """
+    _tables: dict[int, 'StickerTable'] = dict()
+
+    def __init__(self, size: int):
+        from Cube.cube import Cube
+
+        self.size: int = size
+        self._cube: Cube = Cube(size)  # its faces supply the geometry
+
+        self.other_locations: dict[Location, tuple[Location, ...]] = dict()
+        for face_id in FACE_IDS:
+            for row in range(size):
+                for col in range(size):
+                    if row in (0, size - 1) or col in (0, size - 1):
+                        location = Location(face_id, row, col)
+                        self.other_locations[location] = tuple(self._cube.find_other_sticker_locations(location))
+
+        self._traces: list[dict[Location, Location]] = [None] * (len(ORIENTATIONS) * size * 2)  # by move code
+        self._sticker_moves: list[dict[int, int]] = [None] * (len(ORIENTATIONS) * size * 2)  # by move code
+        self._place_moves: list[tuple[tuple[int, ...], tuple[int, ...]]] = [None] * (len(ORIENTATIONS) * size * 2)
+        self._places: list[tuple[int, ...]] = None
+        self._sticker_places: list[int] = None
+
+    @staticmethod
+    def get(size: int) -> 'StickerTable':
+        """
+        Returns the (cached) sticker table of `size`x`size` cubes.
+        """
+        table = StickerTable._tables.get(size)
+        if table is None:
+            table = StickerTable(size)
+            StickerTable._tables[size] = table
+        return table
+
+    def get_other_locations(self, location: Location) -> tuple[Location, ...]:
+        """
+        Returns the locations of the other stickers of the piece of `location` (see:
+        `Cube.get_other_sticker_locations`).
+        """
+        return self.other_locations.get(location, ())
+
+    def get_trace(self, move: Move) -> dict[Location, Location]:
+        """
+        Returns a dictionary which maps each location that moves to another face by `move` to its location after
+        `move`.
+        """
+        trace = self._traces[move.code]
+        if trace is None:
+            trace = self._compute_trace(move)
+            self._traces[move.code] = trace
+        return trace
+
+    def get_places(self) -> tuple[list[tuple[int, ...]], list[int]]:
+        """
+        Returns the places of the pieces of the cube, each one as the sorted indexes of its stickers, and for each
+        sticker index the index of its place.
+        """
+        if self._places is None:
+            places = []
+            sticker_places = [-1] * (len(FACE_IDS) * self.size * self.size)
+            for index in range(len(sticker_places)):
+                if sticker_places[index] == -1:
+                    location = Location.from_index(index, self.size)
+                    place = tuple(sorted([index] + [other_location.to_index(self.size)
+                                                    for other_location in self.get_other_locations(location)]))
+                    for place_index in place:
+                        sticker_places[place_index] = len(places)
+                    places.append(place)
+            self._places, self._sticker_places = places, sticker_places
+        return self._places, self._sticker_places
+
+    def get_sticker_moves(self, move: Move) -> dict[int, int]:
+        """
+        Returns a dictionary which maps the index of each sticker that is moved by `move` (on its strips and on its
+        in-place rotated face) to its index after `move`.
+        """
+        sticker_moves = self._sticker_moves[move.code]
+        if sticker_moves is None:
+            sticker_moves = {location.to_index(self.size): new_location.to_index(self.size)
+                             for location, new_location in self.get_trace(move).items()}
+
+            rotated_face_id, clockwise = self._cube.get_inplace_rotated_face(move)
+            if rotated_face_id is not None:
+                offset, last = self._cube.faces[rotated_face_id].offset, self.size - 1
+                for row in range(self.size):
+                    for col in range(self.size):
+                        new_row, new_col = (col, last - row) if clockwise else (last - col, row)
+                        sticker_moves[offset + row * self.size + col] = offset + new_row * self.size + new_col
+
+            self._sticker_moves[move.code] = sticker_moves
+        return sticker_moves
+
+    def get_place_moves(self, move: Move) -> tuple[tuple[int, ...], tuple[int, ...]]:
+        """
+        Returns the indexes of the places (see: `get_places`) whose pieces are moved to other places by `move`, and the
+        indexes of the places they are moved to.
+        """
+        place_moves = self._place_moves[move.code]
+        if place_moves is None:
+            _, sticker_places = self.get_places()
+            new_places = {sticker_places[index]: sticker_places[new_index]
+                          for index, new_index in self.get_sticker_moves(move).items()}
+            moved_places = [place for place, new_place in new_places.items() if place != new_place]
+            place_moves = tuple(moved_places), tuple(new_places[place] for place in moved_places)
+            self._place_moves[move.code] = place_moves
+        return place_moves
+
+    def _compute_trace(self, move: Move) -> dict[Location, Location]:
+        effected_faces = Orientation.get_orientation_rotation_faces_ids(move.orientation)
+        stickers_indexes = range(len(FACE_IDS) * self.size * self.size)
+        strips = [stickers_indexes[self._cube.faces[face_id].get_strip_slice(move.orientation, move.index)]
+                  for face_id in effected_faces]
+
+        direction = 1 if move.is_forward else -1
+        trace = dict()
+        for i, strip in enumerate(strips):
+            new_strip = strips[(i + direction) % len(strips)]
+            for index, new_index in zip(strip, new_strip):
+                trace[Location.from_index(index, self.size)] = Location.from_index(new_index, self.size)
+        return trace
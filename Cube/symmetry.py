@@ -0,0 +1,167 @@
+from itertools import permutations, product
+from typing import Optional
+
+from Cube.face_id import FaceID, FACE_IDS
+from Cube.orientation import Orientation
+from Cube.permutation import Permutation
+
+Vector = tuple[int, int, int]
+
+# The axes are x (from L to R), y (from D to U) and z (from B to F). For each face: its normal, and the directions in
+# which its rows and its columns grow.
+FACE_AXES: dict[FaceID, tuple[Vector, Vector, Vector]] = {
+    FaceID.U: ((0, 1, 0), (0, 0, 1), (1, 0, 0)),
+    FaceID.D: ((0, -1, 0), (0, 0, 1), (-1, 0, 0)),
+    FaceID.R: ((1, 0, 0), (0, 0, 1), (0, -1, 0)),
+    FaceID.L: ((-1, 0, 0), (0, 0, 1), (0, 1, 0)),
+    FaceID.F: ((0, 0, 1), (0, -1, 0), (1, 0, 0)),
+    FaceID.B: ((0, 0, -1), (0, 1, 0), (1, 0, 0))}
+
+
+def get_sticker_coordinates(size: int) -> list[Vector]:
+    """
+    Returns the coordinates of the center of each sticker of a `size`x`size` cube (in the order of `Cube.state`),
+    doubled so they are integers: the faces are at distance `size` from the center of the cube.
+    """
+    coordinates = []
+    for face_id in FACE_IDS:
+        normal, row_direction, col_direction = FACE_AXES[face_id]
+        for row in range(size):
+            for col in range(size):
+                row_offset, col_offset = 2 * row - (size - 1), 2 * col - (size - 1)
+                coordinates.append(tuple(size * n + row_offset * r + col_offset * c
+                                         for n, r, c in zip(normal, row_direction, col_direction)))
+    return coordinates
+
+
+def get_piece_sticker_points(point: Vector, size: int) -> list[Vector]:
+    """
+    Returns the coordinates of the stickers of the piece whose center is at `point` (which has the doubled coordinates
+    of `get_sticker_coordinates`). The two stickers of an edge piece are ordered so that their normals and the
+    direction from the middle of the edge to the piece are a right-handed system, which moves keep, so the colors of
+    a piece in this order tell its position in the solved cube.
+    """
+    axes = [axis for axis in range(3) if abs(point[axis]) == size - 1]
+    if len(axes) == 2:
+        (first, second), (edge_axis,) = axes, {0, 1, 2} - set(axes)
+        # the determinant of the normals and the direction, which are unit vectors along different axes
+        handedness = point[first] * point[second] * point[edge_axis] * (1 if (edge_axis - first) % 3 == 2 else -1)
+        if handedness < 0:
+            axes.reverse()
+
+    points = []
+    for axis in axes:
+        sticker_point = list(point)
+        sticker_point[axis] += 1 if point[axis] > 0 else -1
+        points.append(tuple(sticker_point))
+    return points
+
+
+class Symmetry:
+    def __init__(self, index: int, matrix: tuple[Vector, Vector, Vector]):
+        """
+        A symmetry of the cube: a rotation of the whole cube, or a rotation followed by a reflection (a mirror).
+        :param index: The index of the symmetry in `SYMMETRIES`.
+        :param matrix: The matrix of the symmetry, which maps the coordinates of a point (see: `FACE_AXES`) to the
+            coordinates it is moved to. Every row and every column has a single nonzero item, which is 1 or -1.
+        """
+        self.index: int = index
+        self.matrix: tuple[Vector, Vector, Vector] = matrix
+        self._permutations: dict[int, Permutation] = dict()
+        self._face_relabeling: Optional[dict[FaceID, tuple[FaceID, int]]] = None
+
+    @property
+    def is_mirror(self) -> bool:
+        (a, b, c), (d, e, f), (g, h, i) = self.matrix
+        return a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g) < 0
+
+    def apply_to_vector(self, vector: Vector) -> Vector:
+        return tuple(sum(m * v for m, v in zip(row, vector)) for row in self.matrix)
+
+    def inverse(self) -> 'Symmetry':
+        transposed = tuple(zip(*self.matrix))
+        return next(symmetry for symmetry in SYMMETRIES if symmetry.matrix == transposed)
+
+    def get_face_relabeling(self) -> dict[FaceID, tuple[FaceID, int]]:
+        """
+        Describes the symmetry (which must be a rotation) as a relabeling of the faces: each face of the rotated cube
+        is a face of the cube, rotated in place.
+        :return: For each face of the rotated cube, the face it was before the rotation, and the rotation to add to
+            that face (see: `Face.rotation`) so its stickers are seen in their new places.
+        :raise ValueError: If the symmetry is a mirror.
+        """
+        if self.is_mirror:
+            raise ValueError("A mirror can not be described as a relabeling of the faces.")
+        if self._face_relabeling is not None:
+            return self._face_relabeling
+
+        size = 3
+        face_area = size * size
+        coordinates = get_sticker_coordinates(size)
+        indexes = {coordinate: index for index, coordinate in enumerate(coordinates)}
+        inverse = self.inverse()
+        # where the stickers at (0, 0) and (0, 1) of a face are seen after each rotation of the face (see: `Face`)
+        rotations = {((0, 0), (0, 1)): 0, ((2, 0), (1, 0)): 1, ((2, 2), (2, 1)): 2, ((0, 2), (1, 2)): 3}
+
+        relabeling = dict()
+        for face_index, face_id in enumerate(FACE_IDS):
+            # the stickers at (0, 0) and (0, 1) of the face were at these indexes before the rotation
+            first_index, second_index = (indexes[inverse.apply_to_vector(coordinates[face_index * face_area + col])]
+                                         for col in (0, 1))
+            positions = divmod(first_index % face_area, size), divmod(second_index % face_area, size)
+            relabeling[face_id] = FACE_IDS[first_index // face_area], rotations[positions]
+        self._face_relabeling = relabeling
+        return relabeling
+
+    def get_permutation(self, size: int) -> Permutation:
+        """
+        Returns the sticker permutation (see: `Permutation`) which moves each sticker of a `size`x`size` cube to where
+        the symmetry moves it. Permutations are computed on the first use of each size.
+        """
+        permutation = self._permutations.get(size)
+        if permutation is None:
+            coordinates = get_sticker_coordinates(size)
+            indexes = {coordinate: index for index, coordinate in enumerate(coordinates)}
+            inverse = self.inverse()
+            # the sticker which is moved to a coordinate is the one at the inverse image of the coordinate
+            permutation = Permutation(tuple(indexes[inverse.apply_to_vector(coordinate)]
+                                            for coordinate in coordinates))
+            self._permutations[size] = permutation
+        return permutation
+
+    def __repr__(self):
+        return f"Symmetry({self.index}, {self.matrix})"
+
+
+def _generate_symmetries() -> list[Symmetry]:
+    matrices = []
+    for axes in permutations(range(3)):
+        for signs in product((1, -1), repeat=3):
+            matrices.append(tuple(tuple(signs[row] if col == axes[row] else 0 for col in range(3))
+                                  for row in range(3)))
+
+    symmetries = [Symmetry(0, matrix) for matrix in matrices]
+    symmetries.sort(key=lambda symmetry: (symmetry.is_mirror, symmetry.matrix != ((1, 0, 0), (0, 1, 0), (0, 0, 1))))
+    for index, symmetry in enumerate(symmetries):
+        symmetry.index = index
+    return symmetries
+
+
+# The 48 symmetries of the cube: the identity, the other 23 rotations, and then the 24 mirrors.
+SYMMETRIES: list[Symmetry] = _generate_symmetries()
+ROTATIONS_NUMBER = 24
+
+
+def get_symmetry(matrix: tuple[Vector, Vector, Vector]) -> Symmetry:
+    return next(symmetry for symmetry in SYMMETRIES if symmetry.matrix == matrix)
+
+
+# The rotation of the whole cube which has the effect of moving all the slices of an orientation, by the orientation
+# and the direction of the moves.
+WHOLE_CUBE_ROTATIONS: dict[tuple[Orientation, bool], Symmetry] = {
+    (Orientation.X, True): get_symmetry(((0, 0, 1), (0, 1, 0), (-1, 0, 0))),
+    (Orientation.X, False): get_symmetry(((0, 0, -1), (0, 1, 0), (1, 0, 0))),
+    (Orientation.Y, True): get_symmetry(((1, 0, 0), (0, 0, 1), (0, -1, 0))),
+    (Orientation.Y, False): get_symmetry(((1, 0, 0), (0, 0, -1), (0, 1, 0))),
+    (Orientation.Z, True): get_symmetry(((0, -1, 0), (1, 0, 0), (0, 0, 1))),
+    (Orientation.Z, False): get_symmetry(((0, 1, 0), (-1, 0, 0), (0, 0, 1)))}
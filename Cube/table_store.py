@@ -0,0 +1,167 @@
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array, typecodes
+from multiprocessing import Pool
+from typing import Callable, Optional, Union
+
+Table = Union[array, bytearray, memoryview]
+
+TABLE_FORMAT_VERSION = 1
+TABLES_DIRECTORY_VARIABLE = "RUBIKS_CUBE_TABLES"  # an environment variable which overrides the default directory
+DEFAULT_TABLES_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "RubiksCube", "tables")
+
+# The header of a table file: a magic, the format version, the table version (see: `TableSpec`), the type code and the
+# byte order of the items, the number of items and the CRC-32 of the items. The items follow the header.
+_MAGIC = b"RCTB"
+_HEADER = struct.Struct("<4sII1s1s2xQI4x")
+
+
+class TableSpec:
+    def __init__(self, name: str, version: int, build: Callable[..., Union[array, bytearray]],
+                 dependencies: tuple[str, ...] = ()):
+        """
+        Describes a table which a `TableStore` builds once and then loads from its file.
+        :param name: The name of the table, which names its file.
+        :param version: The version of the table's content. Increasing it makes stored tables of older versions be
+            rebuilt, so it must be increased whenever `build` changes the table.
+        :param build: Builds the table from the tables of `dependencies` (given in their order). It must be defined at
+            module level, so other processes can build the table.
+        :param dependencies: The names of the tables which the table is built from.
+        """
+        self.name: str = name
+        self.version: int = version
+        self.build: Callable[..., Union[array, bytearray]] = build
+        self.dependencies: tuple[str, ...] = dependencies
+
+    def __repr__(self):
+        return f"TableSpec({self.name!r}, {self.version})"
+
+
+class TableStore:
+    def __init__(self, directory: str = None, processes: int = None):
+        """
+        Keeps tables in files: each table is built once (tables which do not depend on each other are built in
+        parallel) and is then mapped to memory (by `mmap`) when it is loaded, so loading takes no time and the
+        processes of a host share the pages of a table. Each file has a format version, the table's version and a
+        checksum, and files which do not match their table are rebuilt.
+        :param directory: The directory of the table files. Defaults to the `RUBIKS_CUBE_TABLES` environment variable,
+            or to `DEFAULT_TABLES_DIRECTORY`.
+        :param processes: The number of processes which build tables. Defaults to the number of CPUs.
+        """
+        if directory is None:
+            directory = os.environ.get(TABLES_DIRECTORY_VARIABLE, DEFAULT_TABLES_DIRECTORY)
+        self.directory: str = directory
+        if processes is None:
+            processes = os.cpu_count() or 1
+        self.processes: int = processes
+
+    def get_path(self, spec: TableSpec) -> str:
+        return os.path.join(self.directory, f"{spec.name}.v{spec.version}.table")
+
+    def load(self, specs: list[TableSpec]) -> dict[str, Table]:
+        """
+        Loads tables, and builds the tables which are missing (or whose files are invalid) first.
+        Tables are built in memory if their files can not be written.
+        :param specs: The tables to load, which must include the dependencies of every table.
+        :return: The tables by their names. Tables which were loaded from files are read-only `memoryview`s.
+        :raise ValueError: If a table depends on a table which is not in `specs`, or if tables depend on each other.
+        """
+        specs_by_name = {spec.name: spec for spec in specs}
+        for spec in specs:
+            missing_dependencies = set(spec.dependencies) - specs_by_name.keys()
+            if missing_dependencies:
+                raise ValueError(f"The table {spec.name} depends on the missing tables {missing_dependencies}.")
+
+        tables: dict[str, Table] = dict()
+        missing = []
+        for spec in specs:
+            table = self._map(spec)
+            if table is None:
+                missing.append(spec)
+            else:
+                tables[spec.name] = table
+
+        while missing:
+            ready = [spec for spec in missing if all(name in tables for name in spec.dependencies)]
+            if not ready:
+                raise ValueError(f"The tables {missing} depend on each other.")
+            missing = [spec for spec in missing if spec not in ready]
+            if self.processes > 1 and len(ready) > 1:
+                with Pool(min(self.processes, len(ready))) as pool:
+                    pool.starmap(_build_table_file, [(self.directory, spec, [specs_by_name[name] for name in
+                                                                             spec.dependencies]) for spec in ready])
+            for spec in ready:
+                table = self._map(spec)
+                if table is None:  # it was not built by another process, or its file could not be written
+                    table = spec.build(*[tables[name] for name in spec.dependencies])
+                    if self._write(spec, table):
+                        table = self._map(spec) or table
+                tables[spec.name] = table
+        return tables
+
+    def _map(self, spec: TableSpec) -> Optional[memoryview]:
+        """
+        Maps the file of a table to memory.
+        :return: The items of the table, or None if the file is missing or does not match the table.
+        """
+        try:
+            with open(self.get_path(spec), "rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # a missing file, or an empty one
+            return None
+
+        if len(mapped) < _HEADER.size:
+            return None
+        magic, format_version, version, typecode, byte_order, length, checksum = _HEADER.unpack_from(mapped)
+        if magic != _MAGIC or format_version != TABLE_FORMAT_VERSION or version != spec.version or \
+                byte_order != sys.byteorder[:1].encode():
+            return None
+
+        typecode = typecode.decode("latin-1")
+        if typecode not in typecodes:
+            return None
+        items = memoryview(mapped)[_HEADER.size:]
+        if len(items) != length * array(typecode).itemsize or zlib.crc32(items) != checksum:
+            return None
+        return items.cast(typecode)
+
+    def _write(self, spec: TableSpec, table: Union[array, bytearray]) -> bool:
+        """
+        Writes a table to its file. The file is replaced at once, so it is never seen partly written, and nothing is
+        left behind if writing fails.
+        :return: Whether the file was written.
+        """
+        typecode = table.typecode if isinstance(table, array) else "B"
+        items = memoryview(table).cast("B")
+        header = _HEADER.pack(_MAGIC, TABLE_FORMAT_VERSION, spec.version, typecode.encode(),
+                              sys.byteorder[:1].encode(), len(table), zlib.crc32(items))
+
+        path = self.get_path(spec)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary_path, "wb") as file:
+                file.write(header)
+                file.write(items)
+            os.replace(temporary_path, path)
+        except OSError:
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass  # it was not created
+            return False
+        return True
+
+
+def _build_table_file(directory: str, spec: TableSpec, dependency_specs: list[TableSpec]) -> None:
+    """
+    Builds a table and writes it to its file, in another process (see: `TableStore.load`). The tables it depends on
+    are loaded from their files, and the table is left to the calling process if one of them is missing.
+    """
+    store = TableStore(directory, processes=1)
+    dependencies = [store._map(dependency_spec) for dependency_spec in dependency_specs]
+    if None not in dependencies:
+        store._write(spec, spec.build(*dependencies))
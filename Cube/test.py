@@ -1,13 +1,15 @@
-from cube import Cube
-from solver_3x3 import Solver3x3
+from Cube.cube import Cube
+from Cube.face_id import FaceID
+from Cube.location import Location
+from Cube.solver_3x3 import Solver3x3
+from Cube.validator import InvalidCubeError, validate_cube
 
 
 def average_moves_to_solve(run_times=100, shuffle_moves_number=100):
     s = 0
     for _ in range(run_times):
         cube = Cube(3)
-        shuffle_moves = cube.generate_shuffle_moves(shuffle_moves_number)
-        cube.execute_moves(shuffle_moves)
+        cube.execute_moves(cube.iter_shuffle_moves(shuffle_moves_number))
 
         solver = Solver3x3(cube)
         can_solve, moves = solver.solve()
@@ -15,5 +17,35 @@ def average_moves_to_solve(run_times=100, shuffle_moves_number=100):
     return s / run_times
 
 
+def swap_stickers(cube: Cube, first: Location, second: Location):
+    first_index, second_index = first.to_index(cube.size), second.to_index(cube.size)
+    cube.state[first_index], cube.state[second_index] = cube.state[second_index], cube.state[first_index]
+
+
+def assert_invalid(cube: Cube):
+    try:
+        validate_cube(cube)
+    except InvalidCubeError:
+        return
+    raise AssertionError(f"An invalid {cube.size}x{cube.size} cube was accepted.")
+
+
+def test_flipped_wing_is_rejected():
+    for size in range(4, 8):
+        cube = Cube(size)
+        # the two stickers of a wing of the edge between the U and F faces
+        swap_stickers(cube, Location(FaceID.U, size - 1, 1), Location(FaceID.F, 0, 1))
+        assert_invalid(cube)
+
+
+def test_swapped_center_and_wing_is_rejected():
+    for size in range(4, 8):
+        cube = Cube(size)
+        swap_stickers(cube, Location(FaceID.U, 1, 1), Location(FaceID.F, 0, 1))
+        assert_invalid(cube)
+
+
 if __name__ == '__main__':
+    test_flipped_wing_is_rejected()
+    test_swapped_center_and_wing_is_rejected()
     print(average_moves_to_solve(1000, 1000))
@@ -0,0 +1,218 @@
+from functools import partial
+from typing import Optional
+
+from Cube.color import Color
+from Cube.coordinates import CORNER_PERMUTATION_MOVE_TABLE, FACE_TURNS_NUMBER, FLIP_MOVE_TABLE, PHASE_2_FACE_TURNS, \
+    SLICES_NUMBER, SLICE_MOVE_TABLE, SLICE_PERMUTATIONS_NUMBER, SLICE_PERMUTATION_MOVE_TABLE, SOLVED_SLICE, \
+    TWIST_MOVE_TABLE, UD_EDGE_PERMUTATION_MOVE_TABLE, build_pruning_table, get_face, get_face_turn_cubie_cubes, \
+    get_face_turn_moves, get_flip, get_permutation_rank, get_slice, get_twist
+from Cube.cube import Cube
+from Cube.cubie_cube import CubieCube
+from Cube.face_id import FaceID, FACE_IDS
+from Cube.move import Move
+from Cube.solver import Solver
+from Cube.table_store import Table, TableSpec, TableStore
+from Cube.validator import validate_cube
+
+MAX_SOLUTION_LENGTH = 24
+
+
+def _get_next_turns(turns: list[int]) -> list[list[int]]:
+    """
+    Returns the turns out of `turns` which may follow a turn of each face, and then the turns which may start a
+    search (at index -1). Turns of a face are merged, and turns of opposite faces (which commute) are kept in a single
+    order.
+    """
+    next_turns = []
+    for last_face in list(range(len(FACE_IDS))) + [-1]:
+        next_turns.append([turn for turn in turns if get_face(turn) != last_face and
+                           not (last_face % 2 == 1 and get_face(turn) == last_face - 1)])
+    return next_turns
+
+
+_PHASE_1_NEXT_TURNS: list[list[int]] = _get_next_turns(list(range(FACE_TURNS_NUMBER)))
+_PHASE_2_NEXT_TURNS: list[list[int]] = _get_next_turns(PHASE_2_FACE_TURNS)
+
+_build_phase_1_pruning_table = partial(build_pruning_table, second_number=SLICES_NUMBER, goal=SOLVED_SLICE,
+                                       turns=list(range(FACE_TURNS_NUMBER)))
+_build_phase_2_pruning_table = partial(build_pruning_table, second_number=SLICE_PERMUTATIONS_NUMBER, goal=0,
+                                       turns=PHASE_2_FACE_TURNS)
+
+TWIST_SLICE_PRUNING_TABLE = TableSpec("twist_slice_pruning", 1, _build_phase_1_pruning_table,
+                                      (TWIST_MOVE_TABLE.name, SLICE_MOVE_TABLE.name))
+FLIP_SLICE_PRUNING_TABLE = TableSpec("flip_slice_pruning", 1, _build_phase_1_pruning_table,
+                                     (FLIP_MOVE_TABLE.name, SLICE_MOVE_TABLE.name))
+CORNER_SLICE_PRUNING_TABLE = TableSpec("corner_slice_pruning", 1, _build_phase_2_pruning_table,
+                                       (CORNER_PERMUTATION_MOVE_TABLE.name, SLICE_PERMUTATION_MOVE_TABLE.name))
+EDGE_SLICE_PRUNING_TABLE = TableSpec("edge_slice_pruning", 1, _build_phase_2_pruning_table,
+                                     (UD_EDGE_PERMUTATION_MOVE_TABLE.name, SLICE_PERMUTATION_MOVE_TABLE.name))
+TWO_PHASE_TABLES: list[TableSpec] = [
+    TWIST_MOVE_TABLE, FLIP_MOVE_TABLE, SLICE_MOVE_TABLE, CORNER_PERMUTATION_MOVE_TABLE, UD_EDGE_PERMUTATION_MOVE_TABLE,
+    SLICE_PERMUTATION_MOVE_TABLE, TWIST_SLICE_PRUNING_TABLE, FLIP_SLICE_PRUNING_TABLE, CORNER_SLICE_PRUNING_TABLE,
+    EDGE_SLICE_PRUNING_TABLE]
+
+
+class TwoPhaseTables:
+    """
+    The move tables and the pruning tables of the two-phase solver (see: `TwoPhaseSolver`). Building them takes a few
+    seconds, so they are kept by a `TableStore`, and are built only once.
+    """
+    _tables: Optional['TwoPhaseTables'] = None
+
+    def __init__(self, store: TableStore = None):
+        """
+        :param store: The store of the tables. Defaults to a store in the default directory (see: `TableStore`).
+        """
+        tables = (TableStore() if store is None else store).load(TWO_PHASE_TABLES)
+        self.turn_cubie_cubes: list[CubieCube] = get_face_turn_cubie_cubes()
+
+        self.twist_move: Table = tables[TWIST_MOVE_TABLE.name]
+        self.flip_move: Table = tables[FLIP_MOVE_TABLE.name]
+        self.slice_move: Table = tables[SLICE_MOVE_TABLE.name]
+        self.corner_permutation_move: Table = tables[CORNER_PERMUTATION_MOVE_TABLE.name]
+        self.ud_edge_permutation_move: Table = tables[UD_EDGE_PERMUTATION_MOVE_TABLE.name]
+        self.slice_permutation_move: Table = tables[SLICE_PERMUTATION_MOVE_TABLE.name]
+
+        self.twist_slice_pruning: Table = tables[TWIST_SLICE_PRUNING_TABLE.name]
+        self.flip_slice_pruning: Table = tables[FLIP_SLICE_PRUNING_TABLE.name]
+        self.corner_slice_pruning: Table = tables[CORNER_SLICE_PRUNING_TABLE.name]
+        self.edge_slice_pruning: Table = tables[EDGE_SLICE_PRUNING_TABLE.name]
+
+    @staticmethod
+    def get() -> 'TwoPhaseTables':
+        """
+        Returns the (cached) tables.
+        """
+        if TwoPhaseTables._tables is None:
+            TwoPhaseTables._tables = TwoPhaseTables()
+        return TwoPhaseTables._tables
+
+
+class TwoPhaseSolver(Solver):
+    def __init__(self, cube_3x3: Cube, max_length: int = MAX_SOLUTION_LENGTH):
+        """
+        Solves a 3x3 cube in two phases (Kociemba's algorithm) by searching on coordinates of its pieces (see:
+        `Cube.coordinates`). The first phase orients the corners and the edges and brings the UD-slice edges into the
+        UD-slice, and the second phase solves the cube by the face turns which keep these (see: `PHASE_2_FACE_TURNS`).
+        Both phases are iterative deepening searches, pruned by tables of the distances of pairs of coordinates.
+        :param cube_3x3: The cube to solve. Its centers set the color of each face.
+        :param max_length: The maximal number of face turns (a half turn is a single face turn) in a solution.
+        """
+        super().__init__(cube_3x3)
+        if cube_3x3.size != 3:
+            raise ValueError(f"Given Cube size is {cube_3x3.size} instead of 3.")
+        self.max_length: int = max_length
+
+        self.faces_colors: dict[FaceID, Color] = dict()
+        for face_id in FaceID:
+            self.faces_colors[face_id] = self.cube.faces[face_id][1][1]
+
+        self._tables: Optional[TwoPhaseTables] = None
+        self._cubie_cube: Optional[CubieCube] = None
+        self._turns: list[int] = []
+
+    def solve(self) -> tuple[bool, list[Move]]:
+        """
+        Solves the cube by at most `max_length` face turns. The first solution found is returned, which is usually a
+        few turns longer than the shortest one.
+        :return: Whether a solution was found, and the moves which solve the cube.
+        :raise InvalidCubeError: If the cube can not be solved (see: `validate_cube`), before trying to solve it.
+        """
+        validate_cube(self.cube)
+        self._tables = TwoPhaseTables.get()
+        self._cubie_cube = CubieCube.from_cube(self.cube, self.faces_colors)
+        self._turns = []
+
+        twist = get_twist(self._cubie_cube.corner_orientation)
+        flip = get_flip(self._cubie_cube.edge_orientation)
+        slice_coordinate = get_slice(self._cubie_cube.edge_permutation)
+        for phase_1_length in range(self.max_length + 1):
+            if self._search_phase_1(twist, flip, slice_coordinate, phase_1_length):
+                moves = [move for turn in self._turns for move in get_face_turn_moves(turn)]
+                self.cube.execute_moves(moves)
+                return True, moves
+        return False, []
+
+    def _search_phase_1(self, twist: int, flip: int, slice_coordinate: int, togo: int) -> bool:
+        """
+        Searches for the first phase solutions of exactly `togo` more turns after `self._turns`, and tries to finish
+        each of them by the second phase.
+        :return: Whether a full solution was found (which is left in `self._turns`).
+        """
+        if togo == 0:
+            if twist or flip or slice_coordinate != SOLVED_SLICE:
+                return False
+            # a first phase which ends by a second phase turn was already tried without that turn
+            if self._turns and self._turns[-1] in PHASE_2_FACE_TURNS:
+                return False
+            return self._start_phase_2()
+
+        tables = self._tables
+        twist *= FACE_TURNS_NUMBER
+        flip *= FACE_TURNS_NUMBER
+        slice_index = slice_coordinate * FACE_TURNS_NUMBER
+        for turn in _PHASE_1_NEXT_TURNS[get_face(self._turns[-1]) if self._turns else -1]:
+            next_twist = tables.twist_move[twist + turn]
+            next_flip = tables.flip_move[flip + turn]
+            next_slice = tables.slice_move[slice_index + turn]
+            if tables.twist_slice_pruning[next_twist * SLICES_NUMBER + next_slice] >= togo or \
+                    tables.flip_slice_pruning[next_flip * SLICES_NUMBER + next_slice] >= togo:
+                continue
+
+            self._turns.append(turn)
+            if self._search_phase_1(next_twist, next_flip, next_slice, togo - 1):
+                return True
+            self._turns.pop()
+        return False
+
+    def _start_phase_2(self) -> bool:
+        """
+        Searches for the shortest second phase after the first phase in `self._turns`, within `max_length` turns in
+        total.
+        """
+        cubie_cube = self._cubie_cube
+        for turn in self._turns:
+            cubie_cube = cubie_cube.multiply(self._tables.turn_cubie_cubes[turn])
+
+        corners = get_permutation_rank(cubie_cube.corner_permutation)
+        ud_edges = get_permutation_rank(cubie_cube.edge_permutation[:8])
+        slice_edges = get_permutation_rank([edge - 8 for edge in cubie_cube.edge_permutation[8:]])
+        distance = max(self._tables.corner_slice_pruning[corners * SLICE_PERMUTATIONS_NUMBER + slice_edges],
+                       self._tables.edge_slice_pruning[ud_edges * SLICE_PERMUTATIONS_NUMBER + slice_edges])
+        for togo in range(distance, self.max_length - len(self._turns) + 1):
+            if self._search_phase_2(corners, ud_edges, slice_edges, togo):
+                return True
+        return False
+
+    def _search_phase_2(self, corners: int, ud_edges: int, slice_edges: int, togo: int) -> bool:
+        """
+        Searches for a second phase of exactly `togo` more turns after `self._turns`.
+        :return: Whether the cube is solved by the turns (which are left in `self._turns`).
+        """
+        if togo == 0:
+            return True  # the pruning tables are at distance 0 only at the solved cube
+
+        tables = self._tables
+        corner_permutation_move = tables.corner_permutation_move
+        ud_edge_permutation_move = tables.ud_edge_permutation_move
+        slice_permutation_move = tables.slice_permutation_move
+        corner_slice_pruning = tables.corner_slice_pruning
+        edge_slice_pruning = tables.edge_slice_pruning
+
+        corners *= FACE_TURNS_NUMBER
+        ud_edges *= FACE_TURNS_NUMBER
+        slice_edges *= FACE_TURNS_NUMBER
+        for turn in _PHASE_2_NEXT_TURNS[get_face(self._turns[-1]) if self._turns else -1]:
+            next_slice_edges = slice_permutation_move[slice_edges + turn]
+            next_corners = corner_permutation_move[corners + turn]
+            if corner_slice_pruning[next_corners * SLICE_PERMUTATIONS_NUMBER + next_slice_edges] >= togo:
+                continue
+            next_ud_edges = ud_edge_permutation_move[ud_edges + turn]
+            if edge_slice_pruning[next_ud_edges * SLICE_PERMUTATIONS_NUMBER + next_slice_edges] >= togo:
+                continue
+
+            self._turns.append(turn)
+            if self._search_phase_2(next_corners, next_ud_edges, next_slice_edges, togo - 1):
+                return True
+            self._turns.pop()
+        return False
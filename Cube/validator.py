@@ -0,0 +1,188 @@
+from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
+
+from Cube.color import Color, COLOR_CODES, COLORS
+from Cube.cube import Cube
+from Cube.cubie_cube import CubieCube, CORNERS, get_piece_locations
+from Cube.face_id import FaceID, FACE_IDS
+from Cube.location import Location
+from Cube.symmetry import get_piece_sticker_points, get_sticker_coordinates
+
+# The invariants which `validate_cube` checks
+COLOR_COUNTS = "color counts"
+CENTERS = "centers"
+PIECES = "pieces"
+CORNER_TWIST = "corner twist"
+EDGE_FLIP = "edge flip"
+PERMUTATION_PARITY = "permutation parity"
+
+
+class InvalidCubeError(ValueError):
+    def __init__(self, invariant: str, message: str):
+        """
+        Raised for a cube which can not be reached by moves from a solved cube.
+        :param invariant: The invariant which the cube breaks (for example: `CORNER_TWIST`).
+        :param message: A description of the problem.
+        """
+        super().__init__(f"{invariant}: {message}")
+        self.invariant: str = invariant
+
+
+def validate_cube(cube: Cube) -> None:
+    """
+    Checks that a cube can be reached by moves from a solved cube (with any color scheme), without solving it. All the
+    invariants of 3x3 cubes are checked on the skeleton of odd cubes (their corners, middle edges and centers), and
+    the corner invariants are checked on even cubes. Each orbit of the other centers must have the same number of
+    stickers of each color, and each orbit of wings must have every wing once.
+    :param cube: The cube to check.
+    :raise InvalidCubeError: If the cube breaks an invariant, which is given by the error.
+    """
+    state = cube.state
+    size = cube.size
+
+    color_counts = [state.count(code) for code in range(len(COLORS))]
+    if sorted(color_counts) != [0] * (len(COLORS) - len(FACE_IDS)) + [size * size] * len(FACE_IDS):
+        counts = {color.name: count for color, count in zip(COLORS, color_counts) if count}
+        raise InvalidCubeError(COLOR_COUNTS, f"Expected {len(FACE_IDS)} colors with {size * size} stickers each, got "
+                                             f"{counts}.")
+    if size < 2:
+        return
+
+    skeleton, face_colors = get_skeleton(cube)
+    try:
+        cubie_cube = CubieCube.from_cube(skeleton, face_colors)
+    except ValueError as error:
+        raise InvalidCubeError(PIECES, str(error)) from None
+
+    if sorted(cubie_cube.corner_permutation) != list(range(len(cubie_cube.corner_permutation))):
+        raise InvalidCubeError(PIECES, "A corner appears more than once.")
+    if cubie_cube.get_twist() != 0:
+        raise InvalidCubeError(CORNER_TWIST, f"The corner orientations sum to {cubie_cube.get_twist()} modulo 3.")
+    # the edges and the centers of the skeletons of even cubes are made up, and their corner parity is not fixed
+    if size % 2 == 1:
+        if sorted(cubie_cube.edge_permutation) != list(range(len(cubie_cube.edge_permutation))):
+            raise InvalidCubeError(PIECES, "An edge appears more than once.")
+        if cubie_cube.get_flip() != 0:
+            raise InvalidCubeError(EDGE_FLIP, "The edge orientations sum to 1 modulo 2.")
+        if cubie_cube.get_corner_parity() != cubie_cube.get_edge_parity():
+            raise InvalidCubeError(PERMUTATION_PARITY, "The corner and edge permutations have different parities.")
+
+    face_codes = {face_id: COLOR_CODES[color] for face_id, color in face_colors.items()}
+    center_orbits, wing_orbits = _get_orbits(size)
+    for orbit in center_orbits:
+        # moves keep the centers in their orbits, and the solved cube has the same number of each color in each orbit
+        codes = [state[index] for index in orbit]
+        if any(codes.count(code) != len(orbit) // len(FACE_IDS) for code in face_codes.values()):
+            counts = {COLORS[code].name: codes.count(code) for code in face_codes.values()}
+            raise InvalidCubeError(CENTERS, f"The centers of the orbit of {Location.from_index(orbit[0], size)} have "
+                                            f"the colors {counts}.")
+
+    for orbit in wing_orbits:
+        targets = {tuple(face_codes[FACE_IDS[index // (size * size)]] for index in wing) for wing in orbit}
+        pieces = set()
+        for wing in orbit:
+            piece = tuple(state[index] for index in wing)
+            if piece not in targets or piece in pieces:
+                # a wing flipped in place has the colors of the other wing of its edge, in the same order
+                names = [COLORS[code].name for code in piece]
+                raise InvalidCubeError(PIECES, f"The wing at {Location.from_index(wing[0], size)} has the colors "
+                                               f"{names}, which {'another' if piece in pieces else 'no'} wing of its "
+                                               f"orbit has.")
+            pieces.add(piece)
+
+
+def is_valid_cube(cube: Cube) -> bool:
+    try:
+        validate_cube(cube)
+    except InvalidCubeError:
+        return False
+    return True
+
+
+def get_skeleton(cube: Cube, scheme_corner: int = 0) -> tuple[Cube, dict[FaceID, Color]]:
+    """
+    Returns a 3x3 cube which has the corners of `cube` (and its middle edges and centers, if its size is odd), and the
+    color of each face of the solved 3x3 cube.
+    :param cube: The cube.
+    :param scheme_corner: The position (see: `CORNERS`) of the corner whose colors are the colors of its faces, if the
+        size of the cube is even (odd cubes take the colors of their centers).
+    """
+    size = cube.size
+    if size % 2 == 1:
+        skeleton = Cube(3, state=bytearray(_get_skeleton_getter(size)(cube.state)))
+
+        face_colors = {face_id: COLORS[code] for face_id, code in zip(FACE_IDS, skeleton.state[4::9])}
+        if len(set(face_colors.values())) != len(FACE_IDS):
+            raise InvalidCubeError(CENTERS, "Two centers have the same color.")
+        return skeleton, face_colors
+
+    # even cubes have no centers, so the color scheme is taken from a corner
+    corner_codes = _get_corners_getter(size)(cube.state)
+    corners = [corner_codes[i:i + 3] for i in range(0, len(corner_codes), 3)]
+    face_codes = dict(zip(CORNERS[scheme_corner], corners[scheme_corner]))
+    for face_id in CORNERS[scheme_corner]:
+        codes = set(corner_codes)
+        for corner in corners:
+            if face_codes[face_id] in corner:
+                codes.difference_update(corner)
+        if len(codes) != 1:
+            raise InvalidCubeError(PIECES, f"The color {COLORS[face_codes[face_id]].name} does not have a single "
+                                           f"opposite color.")
+        face_codes[face_id.opposite()] = codes.pop()
+
+    state = bytearray(face_codes[face_id] for face_id in FACE_IDS for _ in range(9))
+    for index, code in zip(_get_corners_indexes(3), corner_codes):
+        state[index] = code
+    return Cube(3, state=state), {face_id: COLORS[code] for face_id, code in face_codes.items()}
+
+
+@lru_cache(maxsize=None)
+def _get_orbits(size: int) -> tuple[list[list[int]], list[list[tuple[int, int]]]]:
+    """
+    Returns the orbits (the positions which moves take a piece to) of the centers and of the wings of a `size`x`size`
+    cube, without the middle centers and the middle edges: the indexes in `Cube.state` of the stickers of each center
+    orbit, and the indexes of the two stickers of each wing of each wing orbit (ordered by `get_piece_sticker_points`).
+    """
+    center_orbits = defaultdict(list)
+    wing_orbits = defaultdict(list)
+    coordinates = get_sticker_coordinates(size)
+    sticker_indexes = {point: index for index, point in enumerate(coordinates)}
+    for index, point in enumerate(coordinates):
+        # the center of the piece is a step from the sticker into the cube
+        position = tuple(coordinate - (1 if coordinate == size else -1 if coordinate == -size else 0)
+                         for coordinate in point)
+        inner_coordinates = [coordinate for coordinate in position if abs(coordinate) != size - 1]
+        if len(inner_coordinates) == 2 and inner_coordinates != [0, 0]:
+            # the face turns map the coordinates of the stickers on their faces to each other
+            location = Location.from_index(index, size)
+            row, col = 2 * location.row - (size - 1), 2 * location.col - (size - 1)
+            center_orbits[min((row, col), (col, -row), (-row, -col), (-col, row))].append(index)
+        elif len(inner_coordinates) == 1 and inner_coordinates != [0]:
+            points = get_piece_sticker_points(position, size)
+            if point == points[0]:
+                wing_orbits[abs(inner_coordinates[0])].append(tuple(sticker_indexes[point] for point in points))
+    return list(center_orbits.values()), list(wing_orbits.values())
+
+
+@lru_cache(maxsize=None)
+def _get_skeleton_getter(size: int) -> itemgetter:
+    """
+    Returns a getter of the stickers of the skeleton (see: `get_skeleton`) of an odd `size`x`size` cube state.
+    """
+    return itemgetter(*[Location(face_id, row, col).to_index(size) for face_id in FACE_IDS
+                        for row in (0, size // 2, size - 1) for col in (0, size // 2, size - 1)])
+
+
+@lru_cache(maxsize=None)
+def _get_corners_indexes(size: int) -> list[int]:
+    """
+    Returns the indexes of the stickers of the corners of a `size`x`size` cube state, corner after corner (see:
+    `CORNERS`).
+    """
+    return [location.to_index(size) for corner in CORNERS for location in get_piece_locations(corner, size)]
+
+
+@lru_cache(maxsize=None)
+def _get_corners_getter(size: int) -> itemgetter:
+    return itemgetter(*_get_corners_indexes(size))
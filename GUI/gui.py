@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Type
 
 import pygame as pg
 
@@ -7,17 +7,23 @@ from Cube.cube import Cube
 from Cube.face_id import FaceID
 from Cube.move import Move
 from Cube.orientation import Orientation
+from Cube.reduction_solver import ReductionSolver
 from Cube.solver import Solver
+from Cube.solver_2x2 import Solver2x2
 from Cube.solver_3x3 import Solver3x3
+from Cube.validator import InvalidCubeError
 
 BACKGROUND_COLOR = (5, 5, 5, 255)
 NO_COLOR = (0, 0, 0, 0)
+WHOLE_CUBE_ROTATION_KEYS = {pg.K_x: Orientation.X, pg.K_y: Orientation.Y, pg.K_z: Orientation.Z}
 
 
 class GUI:
     def __init__(self, cube: Cube, sticker_size: int = 30, sticker_extra_size: int = 3, face_extra_size: int = 7,
-                 screen_extra_size: int = 50):
+                 screen_extra_size: int = 50, solver_3x3_type: Type[Solver] = Solver3x3):
         self.cube: Cube = cube
+        self.solver_3x3_type: Type[Solver] = solver_3x3_type
+        self.cube.enable_journal()
 
         self.sticker_size: int = sticker_size
         self.sticker_extra_size: int = sticker_extra_size
@@ -32,15 +38,17 @@ class GUI:
             4 * self.full_face_size + face_extra_size + screen_extra_size * 2,
             3 * self.full_face_size + face_extra_size + screen_extra_size * 2)
 
-    def _get_solver(self) -> Union[Solver, None]:
-        solver: Union[Solver, None] = None
+    def _get_solver(self) -> Solver:
         if self.cube.size == 3:
-            solver = Solver3x3(self.cube)
-        return solver
+            return self.solver_3x3_type(self.cube)
+        if self.cube.size == 2:
+            return Solver2x2(self.cube)
+        return ReductionSolver(self.cube, self.solver_3x3_type)
 
     def run(self):
         pg.init()
-        pg.display.set_caption(f"{self.cube.size}x{self.cube.size} Rubik's Cube")
+        title = f"{self.cube.size}x{self.cube.size} Rubik's Cube"
+        pg.display.set_caption(title)
 
         screen = pg.display.set_mode(self.screen_size)
         background = screen.convert_alpha()
@@ -77,15 +85,28 @@ class GUI:
                     if event.key == pg.K_ESCAPE:
                         done = True
                     if event.key == pg.K_s:
-                        solver = self._get_solver()
-                        if solver is not None:
-                            is_solvable, moves = solver.solve()
+                        try:
+                            is_solvable, moves = self._get_solver().solve()
+                        except InvalidCubeError as error:
+                            pg.display.set_caption(f"{title} - can not be solved ({error})")
+                        else:
                             self.cube.execute_moves(moves)
 
                     if event.key == pg.K_r:
                         shuffle_moves = self.cube.generate_shuffle_moves(100)
                         self.cube.execute_moves(shuffle_moves)
 
+                    mods = pg.key.get_mods()
+                    if event.key == pg.K_z and mods & pg.KMOD_CTRL and not mods & pg.KMOD_ALT:
+                        if mods & pg.KMOD_SHIFT:
+                            self.cube.redo()
+                        else:
+                            self.cube.undo()
+                    elif event.key in WHOLE_CUBE_ROTATION_KEYS:
+                        # Ctrl reverses a rotation like it reverses a move, but Ctrl+Z undoes, so z is reversed by
+                        # Ctrl+Alt+Z
+                        self.cube.rotate_cube(WHOLE_CUBE_ROTATION_KEYS[event.key], not mods & pg.KMOD_CTRL)
+
             GUI._update_screen(screen, background, foreground, overlay)
 
     def _draw_sticker(self, surface, face_id: FaceID, row: int, col: int, color_rgba):